@@ -0,0 +1,403 @@
+"""
+Offline benchmark - runs against a synthetic roster, no browser or portal needed.
+
+Usage:
+    python benchmark.py                 # default: 100,000 students
+    python benchmark.py --students 20000
+    python benchmark.py --rows 500      # workbook size for the end-to-end replay run
+    python benchmark.py --workers 1 2 4 # process counts for the parallel matching run
+"""
+
+import argparse
+import contextlib
+import itertools
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import openpyxl
+
+from src.models.roster import Roster
+from src.models.excel_repository import ExcelRepository
+from src.models.student_matcher import StudentMatcher, MATCH_THRESHOLD, SPELLING_VARIANT_THRESHOLD
+from src.controllers.scraper_controller import ScraperController
+from src.services.portal_recorder import PortalRecording, ReplayBackend, REPLAY_LATENCY_RECORDED
+from src.models.identity_cache import IdentityCache
+from src.models.token_stats import TokenStats
+from src.services.student_resolver import StudentResolver
+from src.services.smart_matcher import SmartMatcher
+from src.services.matching_engine import MatchingEngine
+from src.utils.name_cleaner import clean_name, get_similarity
+from src.views.logger_view import configure_console, VERBOSITY_QUIET
+
+SYLLABLES = [
+    "A", "BA", "BI", "BU", "CHI", "DA", "DE", "FA", "GO", "HA", "I", "JO", "KA",
+    "KE", "LA", "MA", "MO", "NA", "NE", "NU", "O", "OLU", "RA", "SA", "SE", "TA",
+    "TU", "U", "WA", "YA", "YE", "ZA",
+]
+
+
+def make_corpus(num_students, seed=7):
+    """Synthetic portal results: [{'admission': 'CDSSJOS/STU/00001', 'name': 'FIRST LAST'}, ...]"""
+    rng = random.Random(seed)
+    # A realistic mix: a few thousand distinct names, heavily re-used
+    pool = sorted({
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        for _ in range(6000)
+    })
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    results = []
+    for i in range(1, num_students + 1):
+        first, last = rng.choices(pool, weights=weights, k=2)
+        results.append({'admission': f"CDSSJOS/STU/{i:05d}", 'name': f"{first} {last}"})
+    return results
+
+
+def portal_search(by_token, term, page_size=None):
+    """What the portal lists for a search: students whose name contains `term`'s words, in that order"""
+    tokens = term.upper().split()
+    rows = by_token.get(tokens[0], [])
+    if len(tokens) > 1:
+        phrase = f" {' '.join(tokens)} "
+        rows = [r for r in rows if phrase in f" {r['name']} "]
+    return rows[:page_size] if page_size else rows
+
+
+def make_workbook_and_fixture(corpus, num_rows, directory, seed=3):
+    """
+    A class workbook (admission in column A, name in column B, from row 3) with
+    names reordered the way teachers type them, plus a portal recording that
+    answers every search the controller can make for it (any name part or pair).
+    """
+    rng = random.Random(seed)
+    # The class the workbook belongs to (searches run with the class filter set)
+    class_students = rng.sample(corpus, min(len(corpus), max(num_rows * 3, 1000)))
+    by_token = {}
+    for student in class_students:
+        for token in set(student['name'].split()):
+            by_token.setdefault(token, []).append(student)
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "CLASS"
+    ws.cell(row=2, column=1, value="ADMISSION NO")
+    ws.cell(row=2, column=2, value="NAME")
+
+    recording = PortalRecording(os.path.join(directory, "fixture.json"))
+    for row_idx, student in enumerate(rng.sample(class_students, num_rows), start=3):
+        first, last = student['name'].split()
+        excel_name = f"{last} {first}" if rng.random() < 0.7 else f"{first} {last} {rng.choice(['A', 'B'])}"
+        ws.cell(row=row_idx, column=2, value=excel_name)
+
+        parts = [p for p in excel_name.upper().split() if len(p) > 2]
+        pairs = [f"{a} {b}" for a, b in itertools.combinations(parts, 2)]
+        for term in [clean_name(excel_name), excel_name.upper()] + parts + pairs:
+            rows = portal_search(by_token, term)
+            recording.add_search(term, rows, latency=2.5)
+
+    workbook_path = os.path.join(directory, "CLASS.xlsx")
+    wb.save(workbook_path)
+    recording.save()
+    return workbook_path, recording.path
+
+
+def measure(build):
+    """Returns (object, bytes allocated while building it)"""
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def bench_roster_memory(corpus):
+    print(f"\n--- Roster memory ({len(corpus):,} students) ---")
+
+    # Copy the strings so the dict layout is measured with its own copies
+    dicts, dict_bytes = measure(lambda: [
+        {'admission': (s['admission'] + ' ')[:-1], 'name': (s['name'] + ' ')[:-1]} for s in corpus
+    ])
+    roster, roster_bytes = measure(lambda: Roster.from_results(corpus))
+
+    print(f"  list of dicts : {dict_bytes / len(corpus):8.1f} bytes/student")
+    print(f"  Roster        : {roster_bytes / len(corpus):8.1f} bytes/student "
+          f"({roster.nbytes() / len(corpus):.1f} in columns, {len(roster.tokens):,} distinct tokens)")
+    del dicts
+    return roster
+
+
+def bench_roster_matching(roster, corpus, queries=20):
+    print(f"\n--- Matching {queries} names against their surname search results ---")
+    matcher = StudentMatcher()
+    rng = random.Random(11)
+    names = [s['name'] for s in rng.sample(corpus, queries)]
+
+    # Candidate set per name = every student sharing its first token (what a portal search returns)
+    by_token = {}
+    for idx, tokens in roster.iter_tokens():
+        for token in set(tokens):
+            by_token.setdefault(token, []).append(idx)
+    candidates = [by_token[name.split()[0]] for name in names]
+    compared = sum(len(c) for c in candidates)
+
+    start = time.perf_counter()
+    for name, indices in zip(names, candidates):
+        matcher.find_best_match(name, [corpus[i] for i in indices])
+    dict_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name, indices in zip(names, candidates):
+        matcher.find_best_match_in_roster(name, roster, indices)
+    roster_time = time.perf_counter() - start
+
+    print(f"  candidates    : {compared:,} ({compared / queries:.0f}/name)")
+    print(f"  list of dicts : {dict_time * 1000 / queries:8.1f} ms/name")
+    print(f"  Roster        : {roster_time * 1000 / queries:8.1f} ms/name")
+
+
+def reference_best_match(excel_name, rows, threshold=SPELLING_VARIANT_THRESHOLD):
+    """StudentMatcher.find_best_match scoring every candidate in full; returns (match, score, similarity calls)"""
+    parts = StudentMatcher.name_parts(excel_name)
+    best_match, best_score, calls = None, 0, 0
+    for row in rows:
+        words = set(row['name'].split())
+        no_space = row['name'].replace(" ", "")
+        exact = len(set(parts).intersection(words)) / len(parts) if parts else 0
+        points = 0
+        for part in parts:
+            if part in no_space:
+                points += 1
+                continue
+            sims = [get_similarity(part, w) for w in words]
+            calls += len(sims)
+            if sims and max(sims) > threshold:
+                points += max(sims)
+        score = max(exact, points / len(parts) if parts else 0)
+        if score > best_score:
+            best_match, best_score = (row['admission'], row['name']), score
+    return best_match, best_score, calls
+
+
+def bench_cascade(corpus, queries=100):
+    print(f"\n--- Scoring cascade, {queries} typed names against their surname search results ---")
+    rng = random.Random(17)
+    by_token = {}
+    for student in corpus:
+        for token in set(student['name'].split()):
+            by_token.setdefault(token, []).append(student)
+
+    cases = []
+    for student in rng.sample(corpus, queries):
+        first, last = student['name'].split()
+        roll = rng.random()
+        if roll < 0.4:
+            excel_name = f"{last} {first}"                                   # reordered: exact match
+        elif roll < 0.8:
+            excel_name = f"{last} {first[:-1]}{rng.choice('AEIOU')} {rng.choice(['A', 'B'])}"  # misspelt
+        else:
+            excel_name = f"{last} {rng.choice(corpus)['name'].split()[0]}"   # a different student
+        cases.append((excel_name, portal_search(by_token, last)))
+
+    start = time.perf_counter()
+    reference = [reference_best_match(name, rows) for name, rows in cases]
+    full_time = time.perf_counter() - start
+
+    matcher = StudentMatcher()
+    start = time.perf_counter()
+    results = [matcher.find_best_match(name, rows) for name, rows in cases]
+    cascade_time = time.perf_counter() - start
+
+    full_calls = sum(calls for _, _, calls in reference)
+    same = all(r == (m, s) for r, (m, s, _) in zip(results, reference))
+    print(f"  candidates    : {sum(len(rows) for _, rows in cases):,}")
+    print(f"  full scoring  : {full_time * 1000 / queries:8.2f} ms/name | {full_calls:,} similarity calls")
+    print(f"  cascade       : {cascade_time * 1000 / queries:8.2f} ms/name | {matcher.similarity_calls:,} similarity calls "
+          f"({matcher.similarity_pruned:,} ruled out by bounds, "
+          f"{matcher.candidates_skipped:,} candidates after a perfect match)")
+    print(f"  results       : {'identical' if same else 'DIFFERENT RESULTS'}")
+
+
+def bench_parallel(roster, corpus, worker_counts, queries=200):
+    print(f"\n--- Offline matching engine, {queries} names against the full roster "
+          f"({os.cpu_count()} CPU cores) ---")
+    rng = random.Random(13)
+    rows = [(i, s['name']) for i, s in enumerate(rng.sample(corpus, queries))]
+
+    baseline = None
+    reference = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = list(MatchingEngine(roster, workers=workers).match(rows))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        reference = reference or results
+        same = "identical" if results == reference else "DIFFERENT RESULTS"
+        print(f"  {workers:2d} worker(s)  : {elapsed:8.2f} s ({queries / elapsed:.0f} rows/s, "
+              f"{baseline / elapsed:.2f}x, {same})")
+
+
+def bench_smart_terms(corpus, num_rows=300, page_size=25):
+    print(f"\n--- Smart-retry terms on hard rows (portal shows {page_size} rows per search) ---")
+    rng = random.Random(5)
+    # A class whose students carry a middle name too (drawn with the same Zipf skew)
+    class_students = []
+    for student in rng.sample(corpus, min(len(corpus), 3000)):
+        first, last = student['name'].split()
+        middle = rng.choice(corpus)['name'].split()[0]
+        class_students.append({'admission': student['admission'], 'name': f"{first} {middle} {last}"})
+    by_token = {}
+    for student in class_students:
+        for token in set(student['name'].split()):
+            by_token.setdefault(token, []).append(student)
+
+    configure_console(VERBOSITY_QUIET)
+    matcher = StudentMatcher()
+    rows = []
+    for student in rng.sample(class_students, num_rows):
+        first, middle, last = student['name'].split()
+        rows.append((f"{last} {first} {middle}", student['admission']))
+
+    orders = [
+        ("in name order", SmartMatcher()),
+        ("by selectivity", SmartMatcher(TokenStats.from_roster(Roster.from_results(class_students)))),
+    ]
+    for label, smart_matcher in orders:
+        resolver = StudentResolver(matcher, smart_matcher)
+        hard = retries = scraped = resolved = 0
+        for excel_name, admission in rows:
+            first_rows = portal_search(by_token, clean_name(excel_name), page_size)
+            if matcher.find_best_match(excel_name, first_rows)[1] >= MATCH_THRESHOLD:
+                continue
+            hard += 1
+            searches = []
+            def search(term):
+                result = portal_search(by_token, term, page_size)
+                searches.append(len(result))
+                return result
+            best_match, _, _ = resolver.resolve(excel_name, search)
+            retries += len(searches) - 1
+            scraped += sum(searches[1:])
+            resolved += bool(best_match and best_match[0] == admission)
+        hard = hard or 1
+        print(f"  {label:15s}: {retries / hard:5.2f} retry searches, {scraped / hard:6.1f} rows scraped "
+              f"per hard row, {resolved / hard:.0%} resolved correctly")
+
+
+def bench_save(corpus, num_rows=20_000, sheets=4, updates=12):
+    print(f"\n--- Saving {updates} updates into a {sheets} x {num_rows:,}-row workbook ---")
+    with tempfile.TemporaryDirectory() as directory:
+        workbook_path = os.path.join(directory, "BIG.xlsx")
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+        for sheet in range(sheets):
+            ws = wb.create_sheet(f"SHEET{sheet + 1}")
+            ws.cell(row=2, column=1, value="ADMISSION NO")
+            ws.cell(row=2, column=2, value="NAME")
+            for row_idx, student in enumerate(corpus[:num_rows], start=3):
+                ws.cell(row=row_idx, column=2, value=student['name'])
+                ws.cell(row=row_idx, column=3, value="JSS 1")
+        wb.save(workbook_path)
+
+        for label, delta in (("full workbook", False), ("delta sidecar", True)):
+            excel_repo = ExcelRepository(workbook_path, delta=delta)
+            start = time.perf_counter()
+            excel_repo.load()
+            loaded = time.perf_counter()
+            for row_idx in range(3, 3 + updates):
+                excel_repo.update_student("SHEET1", row_idx, corpus[row_idx]['admission'], 1.0)
+            excel_repo.save()
+            saved = time.perf_counter()
+            print(f"  {label:14s}: load {loaded - start:6.2f} s | save {saved - loaded:6.3f} s")
+
+
+def bench_startup(corpus, num_rows=20000, pending=20, login_seconds=2.0):
+    print(f"\n--- Startup: time to first search ({num_rows} rows, {login_seconds:g} s login) ---")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        workbook_path, fixture_path = make_workbook_and_fixture(corpus, pending, directory)
+        # Rows that already have their number ahead of the pending ones: the run is all startup
+        wb = openpyxl.load_workbook(workbook_path)
+        ws = wb.active
+        ws.insert_rows(3, num_rows - pending)
+        for row_idx, student in enumerate(corpus[:num_rows - pending], start=3):
+            ws.cell(row=row_idx, column=1, value=student['admission'])
+            ws.cell(row=row_idx, column=2, value=student['name'])
+        wb.save(workbook_path)
+        recording = PortalRecording.load(fixture_path)
+        recording.data['login_latency'] = [login_seconds]
+        for entry in recording.data['searches'].get("", {}).values():
+            entry['latency'] = 0.0
+        recording.save()
+
+        os.chdir(directory)
+        try:
+            configure_console(VERBOSITY_QUIET)
+            controller = ScraperController(
+                workbook_path, "replay://portal", None, None,
+                replay=ReplayBackend(fixture_path, REPLAY_LATENCY_RECORDED),
+                identity_cache=IdentityCache(None)
+            )
+            with contextlib.redirect_stderr(io.StringIO()):
+                controller.run()
+        finally:
+            os.chdir(cwd)
+
+    for step, seconds in controller.startup_times.items():
+        print(f"  {step:14s}: {seconds:6.2f} s")
+    print(f"  one after other: {sum(controller.startup_times.values()):6.2f} s")
+    print(f"  first search  : {controller.first_search_at:6.2f} s after start")
+
+
+def bench_replay(corpus, num_rows):
+    print(f"\n--- End-to-end controller run on a replayed portal ({num_rows} rows) ---")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        workbook_path, fixture_path = make_workbook_and_fixture(corpus, num_rows, directory)
+        os.chdir(directory)  # logs/ and the _updated workbook stay in the temp dir
+        try:
+            configure_console(VERBOSITY_QUIET)
+            controller = ScraperController(
+                workbook_path, "replay://portal", None, None,
+                replay=ReplayBackend(fixture_path),
+                identity_cache=IdentityCache(None)
+            )
+            start = time.perf_counter()
+            with contextlib.redirect_stderr(io.StringIO()):  # per-row warnings
+                controller.run()
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    print(f"  total         : {elapsed:8.2f} s ({num_rows / elapsed:.0f} rows/s)")
+    print(f"  searches      : {controller.portal_repo.searches:,} "
+          f"({controller.portal_repo.misses} without a recording)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark on a synthetic roster")
+    parser.add_argument("--students", type=int, default=100_000, help="Roster size (default: 100000)")
+    parser.add_argument("--rows", type=int, default=300, help="Workbook rows for the replay run (default: 300)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Process counts for the parallel matching run (default: 1 2 4 8)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("OFFLINE BENCHMARK")
+    print("="*70)
+
+    corpus = make_corpus(args.students)
+    roster = bench_roster_memory(corpus)
+    bench_roster_matching(roster, corpus)
+    bench_cascade(corpus)
+    bench_parallel(roster, corpus, args.workers)
+    bench_smart_terms(corpus)
+    bench_save(corpus)
+    bench_startup(corpus)
+    bench_replay(corpus, args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import os
+from collections import defaultdict
+
+from src.models.batch_manifest import sheet_fingerprints, updated_path_for
+from src.models.excel_repository import ExcelRepository
+from src.models.identity_cache import normalize_name
+from src.models.work_shard import ShardResults
+from src.views.logger_view import get_console
+
+CONFLICT_SHARDS_DISAGREE = "shards disagree"
+CONFLICT_ROW_CHANGED = "row changed since split"
+CONFLICT_ALREADY_FILLED = "already filled with another number"
+CONFLICT_DUPLICATE = "same admission for different names"
+
+class MergeController:
+    """
+    `merge`: write every shard's results back into one _updated.xlsx.
+
+    A row is not written (and is reported) when:
+      - two results files give it different admission numbers (unless prefer_best)
+      - its name in the workbook no longer matches the shard's (rows moved/edited)
+      - it meanwhile got a different admission number in the workbook
+      - the same admission number was given to rows with different names in a sheet
+    """
+
+    def __init__(self, excel_path, results_paths, prefer_best=False):
+        self.excel_path = updated_path_for(excel_path)
+        self.results_paths = results_paths
+        self.prefer_best = prefer_best
+        self.console = get_console()
+
+    def load_results(self):
+        """Returns ({(sheet, row): [result, ...]}, headers)"""
+        by_row = defaultdict(list)
+        headers = []
+        for path in self.results_paths:
+            header, rows = ShardResults.read(path)
+            headers.append(header)
+            for row in rows:
+                by_row[(row['sheet'], row['row'])].append(row)
+        return by_row, headers
+
+    def merge(self):
+        by_row, headers = self.load_results()
+        self._check_headers(headers)
+
+        excel_repo = ExcelRepository(self.excel_path)
+        if not excel_repo.load():
+            return None, []
+
+        split_fingerprints = headers[0].get('fingerprints', {}) if headers else {}
+        current = sheet_fingerprints(excel_repo.wb)
+        changed_sheets = [s for s, fp in split_fingerprints.items() if current.get(s, {}).get('hash') != fp['hash']]
+        if changed_sheets:
+            self.console.warning(f"⚠ Changed since the split: {', '.join(changed_sheets)} (rows are checked by name)")
+
+        planned = {}
+        conflicts = []
+        no_match = unchanged = 0
+
+        for (sheet_name, row_idx), results in sorted(by_row.items(), key=lambda item: (item[0][0], item[0][1])):
+            admissions = {r['admission'] for r in results if r['admission']}
+            chosen = max(results, key=lambda r: (r['admission'] is not None, r['score']))
+            if len(admissions) > 1 and not self.prefer_best:
+                conflicts.append(self._conflict(chosen, CONFLICT_SHARDS_DISAGREE, ", ".join(sorted(admissions))))
+                continue
+            if not chosen['admission']:
+                no_match += 1
+                continue
+
+            if sheet_name not in excel_repo.wb.sheetnames:
+                conflicts.append(self._conflict(chosen, CONFLICT_ROW_CHANGED, "sheet missing"))
+                continue
+            ws = excel_repo.wb[sheet_name]
+            name_now = ws.cell(row=row_idx, column=2).value
+            if normalize_name(name_now or "") != normalize_name(chosen['name']):
+                conflicts.append(self._conflict(chosen, CONFLICT_ROW_CHANGED, f"now '{name_now}'"))
+                continue
+
+            admission_now = ws.cell(row=row_idx, column=1).value
+            if isinstance(admission_now, str) and "CDSSJOS" in admission_now:
+                if admission_now.strip() == chosen['admission']:
+                    unchanged += 1
+                else:
+                    conflicts.append(self._conflict(chosen, CONFLICT_ALREADY_FILLED, admission_now))
+                continue
+
+            planned[(sheet_name, row_idx)] = chosen
+
+        # One student given to different names within a sheet: at least one is wrong
+        names_by_admission = defaultdict(set)
+        for (sheet_name, _), result in planned.items():
+            names_by_admission[(sheet_name, result['admission'])].add(normalize_name(result['name']))
+        for key, result in list(planned.items()):
+            if len(names_by_admission[(key[0], result['admission'])]) > 1:
+                conflicts.append(self._conflict(result, CONFLICT_DUPLICATE, result['admission']))
+                del planned[key]
+
+        for (sheet_name, row_idx), result in planned.items():
+            excel_repo.update_student(sheet_name, row_idx, result['admission'])
+        output_path = excel_repo.save() if planned else None
+
+        self._print_report(headers, len(by_row), len(planned), unchanged, no_match, conflicts, output_path)
+        return output_path, conflicts
+
+    def _check_headers(self, headers):
+        workbooks = {h.get('workbook') for h in headers}
+        if len(workbooks) > 1:
+            self.console.warning(f"⚠ Results come from different workbooks: {', '.join(sorted(map(str, workbooks)))}")
+        if headers:
+            expected = set(range(1, headers[0]['shards'] + 1))
+            missing = expected - {h['shard'] for h in headers}
+            if missing:
+                self.console.warning(f"⚠ Missing results for shard(s): {', '.join(map(str, sorted(missing)))}")
+
+    def _conflict(self, result, reason, detail):
+        return {
+            'sheet': result['sheet'], 'row': result['row'], 'name': result['name'],
+            'admission': result['admission'], 'reason': reason, 'detail': detail,
+        }
+
+    def _print_report(self, headers, rows, written, unchanged, no_match, conflicts, output_path):
+        self.console.info(f"\n{'='*70}")
+        self.console.info(f"MERGE: {len(headers)} results files → {os.path.basename(self.excel_path)}")
+        self.console.info(f"{'='*70}")
+        self.console.info(f"  • Rows in results: {rows}")
+        self.console.info(f"  • Written: {written}")
+        self.console.info(f"  • Already up to date: {unchanged}")
+        self.console.info(f"  • No match: {no_match}")
+        self.console.info(f"  • Conflicts (not written): {len(conflicts)}")
+        for conflict in conflicts[:50]:
+            self.console.info(
+                f"    ✗ {conflict['sheet']} Row {conflict['row']}: {conflict['name']} → "
+                f"{conflict['admission'] or '-'} ({conflict['reason']}: {conflict['detail']})"
+            )
+        if len(conflicts) > 50:
+            self.console.info(f"    ... and {len(conflicts) - 50} more")
+        if output_path:
+            self.console.info(f"✓ Saved: {output_path}")
@@ -0,0 +1,69 @@
+import time
+
+from src.models.excel_repository import ExcelRepository
+from src.models.roster import Roster
+from src.models.student_matcher import SMART_MATCH_THRESHOLD
+from src.services.matching_engine import MatchingEngine
+from src.views.logger_view import get_console
+
+class RematchController:
+    """
+    Offline re-matching of a whole workbook against the local roster
+    (see `sync-roster`), on all CPU cores. No browser involved.
+    """
+
+    def __init__(self, excel_path, roster_path, workers=None, min_score=SMART_MATCH_THRESHOLD):
+        self.excel_path = excel_path
+        self.roster_path = roster_path
+        self.workers = workers
+        self.min_score = min_score
+        self.excel_repo = ExcelRepository(excel_path)
+        self.console = get_console()
+
+    def pending_rows(self):
+        """((sheet, row), name) for every named row without an admission number"""
+        for sheet_name in self.excel_repo.get_sheet_names():
+            for student in self.excel_repo.get_students_from_sheet(sheet_name):
+                name = student['name']
+                admission = student['current_admission']
+                if not name or name == "NAME":
+                    continue
+                if admission and isinstance(admission, str) and "CDSSJOS" in admission:
+                    continue
+                yield (sheet_name, student['row_idx']), str(name)
+
+    def run(self):
+        if not self.excel_repo.load():
+            return None
+
+        roster = Roster.open(self.roster_path)
+        engine = MatchingEngine(roster, workers=self.workers, roster_path=self.roster_path)
+        rows = list(self.pending_rows())
+        self.console.info(
+            f"→ Matching {len(rows)} rows against {len(roster):,} students on {engine.workers} worker(s)"
+        )
+
+        started = time.perf_counter()
+        updated = low_confidence = unmatched = 0
+        for (sheet_name, row_idx), best_match, score in engine.match(rows):
+            if best_match and score >= self.min_score:
+                self.excel_repo.update_student(sheet_name, row_idx, best_match[0])
+                updated += 1
+                self.console.debug(f"  ✓ {sheet_name} Row {row_idx}: {best_match[1]} → {best_match[0]} ({score:.0%})")
+            elif best_match:
+                low_confidence += 1
+            else:
+                unmatched += 1
+        elapsed = time.perf_counter() - started
+        roster.close()
+
+        output_path = self.excel_repo.save() if updated else None
+        self.console.info(f"\n{'='*70}")
+        self.console.info(f"REMATCH SUMMARY ({elapsed:.1f}s, {len(rows) / elapsed if elapsed else 0:.0f} rows/s)")
+        self.console.info(f"{'='*70}")
+        self.console.info(f"  • Updated (score ≥ {self.min_score:.0%}): {updated}")
+        self.console.info(f"  • Below threshold (left empty): {low_confidence}")
+        self.console.info(f"  • No candidate: {unmatched}")
+        if output_path:
+            self.console.info(f"✓ Saved: {output_path}")
+        return output_path
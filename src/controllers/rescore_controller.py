@@ -0,0 +1,175 @@
+import importlib
+import os
+import time
+from collections import Counter
+
+from src.models.candidate_archive import CandidateArchive
+from src.models.excel_repository import ExcelRepository
+from src.models.token_stats import TokenStats
+from src.models.student_matcher import StudentMatcher, MATCH_THRESHOLD, SMART_MATCH_THRESHOLD
+from src.services.smart_matcher import SmartMatcher
+from src.services.student_resolver import StudentResolver, match_status, STATUS_NO_MATCH
+from src.views.logger_view import get_console
+
+def load_scorer(spec, variant_threshold=None):
+    """
+    'package.module:ClassName' -> instance with find_best_match(); default StudentMatcher.
+    variant_threshold only applies to the default scorer.
+    """
+    if not spec:
+        if variant_threshold is None:
+            return StudentMatcher()
+        return StudentMatcher(variant_threshold=variant_threshold)
+    if variant_threshold is not None:
+        raise ValueError("a spelling-variant threshold only applies to the built-in scorer, not to " + spec)
+    module_name, _, class_name = spec.partition(':')
+    scorer_class = getattr(importlib.import_module(module_name), class_name)
+    return scorer_class()
+
+class ArchivedSearchTerms:
+    """
+    SmartMatcher stand-in for rescoring: a row's smart-retry terms as the run
+    generated them (archived), so unchanged rules retry exactly as the run did.
+    Rows archived without terms (no retry then, or older archives) get freshly
+    generated ones.
+    """
+
+    def __init__(self, smart_matcher):
+        self.smart_matcher = smart_matcher
+        self.terms = None
+
+    def generate_search_terms(self, full_name):
+        if self.terms is not None:
+            return list(self.terms)
+        return self.smart_matcher.generate_search_terms(full_name)
+
+
+class RescoreController:
+    """
+    Re-runs the row decision (standard search + smart retry) over a candidate
+    archive with different thresholds or another scorer, entirely offline.
+    Optionally writes the new assignments into the workbook.
+    """
+
+    def __init__(self, archive_path, match_threshold=MATCH_THRESHOLD,
+                 smart_threshold=SMART_MATCH_THRESHOLD, scorer=None):
+        self.archive_path = archive_path
+        self.match_threshold = match_threshold
+        self.smart_threshold = smart_threshold
+        # Rows that needed no retry in the run: terms ranked with the token counts
+        # of everything the run scraped
+        self.token_stats = TokenStats()
+        self.search_terms = ArchivedSearchTerms(SmartMatcher(self.token_stats))
+        self.resolver = StudentResolver(
+            scorer if scorer is not None else StudentMatcher(), self.search_terms,
+            match_threshold=match_threshold,
+            smart_threshold=smart_threshold
+        )
+        self.console = get_console()
+
+    def rescore(self):
+        """Returns (header, changes); each change is a dict describing one row that moved"""
+        header, records, results_by_term = CandidateArchive.read(self.archive_path)
+        for rows in results_by_term.values():
+            self.token_stats.observe(rows)
+
+        changes = []
+        stats = Counter()
+        started = time.perf_counter()
+
+        for record in records:
+            stats['rows'] += 1
+            old_match = (record['admission'], record['portal_name']) if record['admission'] else None
+            old_status = match_status(old_match, record['score'])
+
+            if record['cached']:
+                # Resolved from the identity cache: no candidates were archived
+                stats['cached'] += 1
+                continue
+
+            # The rows this row's searches actually returned; other terms fall
+            # back to what any row of the run got for them
+            row_results = dict(record['searches'])
+            self.search_terms.terms = record.get('terms')
+            missing = []
+            def search(term):
+                if term in row_results:
+                    return row_results[term]
+                if term not in results_by_term:
+                    missing.append(term)
+                    return []
+                return results_by_term[term]
+
+            new_match, new_score, _ = self.resolver.resolve(record['name'], search)
+            new_status = match_status(new_match, new_score, self.match_threshold, self.smart_threshold)
+            if missing:
+                # The new rules wanted a search the original run never made
+                stats['incomplete'] += 1
+
+            status_changed = new_status != old_status
+            assignment_changed = (new_match[0] if new_match else None) != record['admission']
+            stats['status_changed'] += status_changed
+            stats['assignment_changed'] += assignment_changed
+
+            if status_changed or assignment_changed:
+                changes.append({
+                    'sheet': record['sheet'],
+                    'row': record['row'],
+                    'name': record['name'],
+                    'old_status': old_status,
+                    'new_status': new_status,
+                    'old_admission': record['admission'],
+                    'new_admission': new_match[0] if new_match else None,
+                    'new_portal_name': new_match[1] if new_match else None,
+                    'old_score': record['score'],
+                    'new_score': new_score,
+                    'incomplete': bool(missing),
+                })
+
+        stats['seconds'] = time.perf_counter() - started
+        self._print_report(header, stats, changes)
+        return header, changes
+
+    def apply(self, changes, workbook_path):
+        """Write changed assignments into the workbook (no browser involved)"""
+        excel_repo = ExcelRepository(workbook_path)
+        if not excel_repo.load():
+            return None
+
+        applied = cleared = 0
+        for change in changes:
+            if change['old_admission'] == change['new_admission']:
+                continue
+            if change['new_status'] == STATUS_NO_MATCH:
+                excel_repo.clear_student(change['sheet'], change['row'])
+                cleared += 1
+            else:
+                excel_repo.update_student(change['sheet'], change['row'], change['new_admission'])
+                applied += 1
+
+        output_path = excel_repo.save()
+        if output_path:
+            self.console.info(f"\n✓ Applied {applied} new assignments, cleared {cleared} rejected ones: {output_path}")
+        return output_path
+
+    def _print_report(self, header, stats, changes):
+        self.console.info(f"\n{'='*70}")
+        self.console.info(f"RESCORE: {os.path.basename(self.archive_path)}")
+        self.console.info(f"{'='*70}")
+        self.console.info(f"  Workbook: {header.get('workbook')}  |  Class: {header.get('class') or '-'}")
+        self.console.info(f"  Thresholds: match {self.match_threshold:.2f} | smart retry {self.smart_threshold:.2f}")
+        self.console.info(f"  • Rows re-scored: {stats['rows'] - stats['cached']} in {stats['seconds']:.2f}s")
+        self.console.info(f"  • From identity cache (unchanged): {stats['cached']}")
+        self.console.info(f"  • Status changed: {stats['status_changed']}")
+        self.console.info(f"  • Assignment changed: {stats['assignment_changed']}")
+        if stats['incomplete']:
+            self.console.info(f"  ⚠ {stats['incomplete']} rows needed searches that were never made (treated as empty)")
+
+        for change in changes[:50]:
+            self.console.info(
+                f"    {change['sheet']} Row {change['row']}: {change['name']} | "
+                f"{change['old_status']} {change['old_admission'] or '-'} ({change['old_score']:.0%}) → "
+                f"{change['new_status']} {change['new_admission'] or '-'} ({change['new_score']:.0%})"
+            )
+        if len(changes) > 50:
+            self.console.info(f"    ... and {len(changes) - 50} more")
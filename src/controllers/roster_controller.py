@@ -0,0 +1,59 @@
+from src.services.browser_manager import BrowserManager
+from src.services.auth_manager import AuthManager
+from src.services.roster_sync import RosterSync
+from src.models.portal_repository import PortalRepository
+from src.views.logger_view import get_console
+
+DEFAULT_ROSTER_PATH = "cache/roster.bin"
+
+class RosterController:
+    """
+    Refreshes the locally stored portal roster (see RosterSync). The roster is
+    always the whole school: one roster file and one sync state, no class filter.
+    """
+
+    def __init__(self, portal_url, username, password, roster_path=DEFAULT_ROSTER_PATH):
+        self.username = username
+        self.password = password
+
+        self.browser_manager = BrowserManager()
+        self.auth_manager = AuthManager(self.browser_manager, portal_url)
+        self.portal_repo = PortalRepository(self.browser_manager, portal_url)
+        self.roster_sync = RosterSync(self.portal_repo, roster_path)
+        self.console = get_console()
+
+    def run(self, full=False):
+        try:
+            self.browser_manager.setup()
+
+            if not self.auth_manager.login(self.username, self.password):
+                self.console.error("\n✗ Failed to login. Roster not synced.")
+                return None
+
+            self.console.info(f"\n→ Syncing roster: {self.roster_sync.roster_path}{' (full)' if full else ''}")
+            summary = self.roster_sync.sync(full=full)
+            self._print_summary(summary)
+            return summary
+
+        except KeyboardInterrupt:
+            self.console.warning("\n\n⚠ Roster sync interrupted by user (local roster unchanged)")
+        except Exception as e:
+            self.console.error(f"✗ Roster sync failed: {e}", exc_info=True)
+        finally:
+            self.browser_manager.close()
+
+    def _print_summary(self, summary):
+        self.console.info(f"\n{'='*70}")
+        self.console.info(f"✓ ROSTER SYNCED in {summary['elapsed']:.1f}s")
+        self.console.info(f"{'='*70}")
+        self.console.info(f"  • Added: {len(summary['added'])}")
+        self.console.info(f"  • Changed: {len(summary['changed'])}")
+        self.console.info(f"  • Removed: {len(summary['removed'])}")
+        self.console.info(f"  • Students in roster: {summary['total']}")
+        self.console.info(f"  • Pages walked: {summary['pages_walked']} (parsed: {summary['pages_parsed']})")
+        if summary['stopped_early']:
+            self.console.info("  ℹ Stopped early - nothing newer on later pages (use --full to detect removals)")
+        for admission in summary['added'][:20]:
+            self.console.info(f"    + {admission}")
+        for admission in summary['removed'][:20]:
+            self.console.info(f"    - {admission}")
@@ -1,19 +1,40 @@
-import time
-import traceback
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from src.models.excel_repository import ExcelRepository
-from src.models.student_matcher import StudentMatcher
+from src.models.student_matcher import StudentMatcher, SMART_MATCH_THRESHOLD
 from src.models.portal_repository import PortalRepository
 from src.services.browser_manager import BrowserManager
 from src.services.auth_manager import AuthManager
 from src.services.class_filter_manager import ClassFilterManager
-from src.views.logger_view import LoggerView
+from src.views.logger_view import LoggerView, get_console
 from src.utils.name_cleaner import clean_name
+from src.services.student_resolver import StudentResolver
+from src.models.candidate_archive import CandidateArchive
 from src.utils.log_parser import LogParser
 from src.services.smart_matcher import SmartMatcher
+from src.services.rate_controller import AdaptiveRateController
+from src.services.search_cache import SearchCache
+from src.services.watchdog import BrowserWatchdog, OperationTimeout
+from src.models.identity_cache import IdentityCache
+from src.models.token_stats import TokenStats
+from src.services.portal_recorder import (
+    RecordingAuthManager, RecordingClassFilterManager, RecordingPortalRepository
+)
+
+# How match_row() resolved a row
+ROW_CACHED = "cached"        # identity cache, no search
+ROW_SEARCHED = "searched"    # portal search (best_match may still be None)
+ROW_UNPARSED = "unparsed"    # no usable name to search for
+ROW_TIMEOUT = "timeout"      # the browser hung on every attempt
 
 class ScraperController:
-    def __init__(self, excel_path, portal_url, username, password, target_class=None):
+    ROW_ATTEMPTS = 2  # a row whose search hung is retried once on the restarted browser
+
+    def __init__(self, excel_path, portal_url, username, password, target_class=None, max_rate=20,
+                 browser_manager=None, recording=None, replay=None, search_cache=None,
+                 rate_controller=None, identity_cache=None, token_stats=None, archive_dir="./archives",
+                 search_deadline=60, recycle_every=400, memory_limit_mb=1500, delta=False):
         self.excel_path = excel_path
         self.portal_url = portal_url
         self.username = username
@@ -21,66 +42,91 @@ class ScraperController:
         self.target_class = target_class
         
         # Initialize components
-        self.excel_repo = ExcelRepository(excel_path)
-        self.browser_manager = BrowserManager()
-        self.auth_manager = AuthManager(self.browser_manager, portal_url)
-        self.class_filter_manager = ClassFilterManager(self.browser_manager)
-        self.portal_repo = PortalRepository(self.browser_manager, portal_url)
+        # delta: write only the changed cells to a sidecar file instead of re-saving the workbook
+        self.excel_repo = ExcelRepository(excel_path, delta=delta)
+        # A browser handed in by the batch runner is shared across files: we reset it
+        # when done instead of quitting it.
+        self.owns_browser = browser_manager is None
+        self.rate_controller = rate_controller or AdaptiveRateController(max_rate=max_rate)
+        self.search_cache = search_cache if search_cache is not None else SearchCache()
+        self.identity_cache = identity_cache if identity_cache is not None else IdentityCache()
+        # Token frequencies ranking the smart-retry terms (roster-seeded or learned from results)
+        self.token_stats = token_stats if token_stats is not None else TokenStats()
+        self.recording = recording
+
+        if replay:
+            # Offline: recorded portal answers instead of a browser (see ReplayBackend)
+            (self.browser_manager, self.auth_manager,
+             self.class_filter_manager, self.portal_repo) = replay.build()
+        else:
+            self.browser_manager = browser_manager or BrowserManager()
+            self.auth_manager = AuthManager(self.browser_manager, portal_url)
+            self.class_filter_manager = ClassFilterManager(self.browser_manager)
+            self.portal_repo = PortalRepository(self.browser_manager, portal_url, self.rate_controller)
+
+            if recording:
+                self.auth_manager = RecordingAuthManager(self.auth_manager, recording)
+                self.class_filter_manager = RecordingClassFilterManager(self.class_filter_manager, recording)
+                self.portal_repo = RecordingPortalRepository(self.portal_repo, recording)
+        # Deadlines on every browser call, restart on hangs, periodic recycling
+        self.watchdog = BrowserWatchdog(
+            self.browser_manager, self.auth_manager, self.class_filter_manager,
+            username, password, target_class,
+            search_deadline=search_deadline,
+            recycle_every=recycle_every,
+            memory_limit_mb=memory_limit_mb
+        )
         self.matcher = StudentMatcher()
-        self.smart_matcher = SmartMatcher()
+        self.smart_matcher = SmartMatcher(self.token_stats)
+        self.resolver = StudentResolver(self.matcher, self.smart_matcher)
+        self.archive_dir = archive_dir
+        self.archive = None
+
+        # Outcome of the last run(): {sheet: {'updated', 'skipped', 'errors'}} and the saved file
+        self.sheet_outcomes = {}
+        self.output_path = None
+        # Result pages read for the current row (all its searches)
+        self.row_pages = 0
+        # Startup step durations and seconds from run() start to the first portal search
+        self.startup_times = {}
+        self.run_started = None
+        self.first_search_at = None
         self.logger_view = LoggerView(excel_path)
         self.logger = None
+        self.console = get_console()
 
-    def run(self):
+    def run(self, sheets=None):
+        """Process the workbook; `sheets` limits the run to those sheet names"""
         # 0. Single Source of Truth Logic
         # If user passed 'file.xlsx' but 'file_updated.xlsx' exists, use the updated one
         # to ensure we don't lose previous data.
         if '_updated' not in self.excel_path:
             updated_path = self.excel_path.replace('.xlsx', '_updated.xlsx')
             if os.path.exists(updated_path):
-                print(f"ℹ Auto-switching to existing updated file: {os.path.basename(updated_path)}")
+                self.console.info(f"ℹ Auto-switching to existing updated file: {os.path.basename(updated_path)}")
                 self.excel_path = updated_path
+                self.excel_repo.file_path = updated_path
 
-        # 1. Setup Logging
-        log_file, self.logger = self.logger_view.setup_logging()
-        self.matcher.logger = self.logger
-        
-        # 2. Parse Previous Logs (if any)
-        # We need to find logs for BOTH the 'file_updated' name and the original 'file' name
-        # to have a complete history.
-        
-        # Strategy: LogParser now takes the current path.
-        # But if we just switched to _updated, we might miss logs from the original run.
-        # Let's trust LogParser to find relevant logs if they share a common prefix timestamp/pattern
-        # or we just rely on the most recent log regardless of precise name match if possible?
-        # Simpler: The LogParser currently matches 'stem_*'.
-        # file_updated matches file_updated_*.
-        # file matches file_*.
-        
-        # If we switched to file_updated, we only see file_updated logs.
-        # This is acceptable if we assume the user's workflow is linear.
-        
-        latest_log = LogParser.find_latest_log_for_excel(self.excel_path)
-        previous_statuses = {}
-        if latest_log:
-            print(f"ℹ Found previous log: {os.path.basename(latest_log)}")
-            previous_statuses = LogParser.parse_log_file(latest_log)
-            print(f"ℹ Loaded {len(previous_statuses)} previous statuses.")
-        else:
-            print("ℹ No previous log found. Starting fresh.")
+        # 1. Setup Logging (also starts the startup clock)
+        log_file = self.setup_logging()
 
         try:
-            self.browser_manager.setup()
-            
-            if not self.auth_manager.login(self.username, self.password):
-                print(f"\n✗ Failed to login for {self.excel_path}. Skipping...")
+            # 2. Concurrent startup: browser/login/class filter on a helper thread while
+            # this one reads the run history, loads the workbook and plans the rows
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser-startup") as pool:
+                session = pool.submit(self._timed, 'browser + login', self.watchdog.start_session)
+                previous_statuses = self._timed('history', self.load_history, log_file)
+                loaded = self._timed('workbook', self.excel_repo.load)
+                plan = self._timed('plan', self.plan_rows, sheets) if loaded else {}
+                logged_in = session.result()
+            self._report_startup()
+
+            if not logged_in:
+                self.console.error(f"\n✗ Failed to login for {self.excel_path}. Skipping...")
                 return
 
-            # Set class filter once after login
-            self.class_filter_manager.set_class_filter(self.target_class)
-            
-            if not self.excel_repo.load():
-                print(f"\n✗ Failed to load {self.excel_path}. Skipping...")
+            if not loaded:
+                self.console.error(f"\n✗ Failed to load {self.excel_path}. Skipping...")
                 return
             
             total_updated = 0
@@ -88,30 +134,36 @@ class ScraperController:
             total_errors = 0
             
             # Process based on sheets
-            sheet_names = self.excel_repo.get_sheet_names()
-            
-            for sheet_name in sheet_names:
-                print(f"\n{'='*70}")
-                print(f"  PROCESSING SHEET: {sheet_name}")
-                print(f"{'='*70}")
+            for sheet_name, rows in plan.items():
+                self.console.info(f"\n{'='*70}")
+                self.console.info(f"  PROCESSING SHEET: {sheet_name}")
+                self.console.info(f"{'='*70}")
                 
-                updated, skipped, errors = self.process_sheet(sheet_name, previous_statuses)
+                updated, skipped, errors = self.process_sheet(sheet_name, previous_statuses, rows)
+                self.sheet_outcomes[sheet_name] = {'updated': updated, 'skipped': skipped, 'errors': errors}
+                self.excel_repo.checkpoint()
                 
                 total_updated += updated
                 total_skipped += skipped
                 total_errors += errors
                 
             output_path = self.excel_repo.save()
+            self.output_path = output_path
             
             if output_path:
-                print(f"\n{'='*70}")
-                print(f"✓ ENTIRE WORKBOOK SAVED: {output_path}")
-                print(f"{'='*70}")
-                print(f"\nFINAL SUMMARY (All Sheets):")
-                print(f"  • Total Updated: {total_updated}")
-                print(f"  • Total Skipped: {total_skipped}")
-                print(f"  • Total Errors: {total_errors}")
-                print(f"  • Total Processed: {total_updated + total_skipped + total_errors}")
+                self.console.info(f"\n{'='*70}")
+                if self.excel_repo.delta:
+                    self.console.info(f"✓ UPDATES SAVED: {output_path} (run 'apply-updates' to write them into the workbook)")
+                else:
+                    self.console.info(f"✓ ENTIRE WORKBOOK SAVED: {output_path}")
+                self.console.info(f"{'='*70}")
+                self.console.info(f"\nFINAL SUMMARY (All Sheets):")
+                self.console.info(f"  • Total Updated: {total_updated}")
+                self.console.info(f"  • Total Skipped: {total_skipped}")
+                self.console.info(f"  • Total Errors: {total_errors}")
+                self.console.info(f"  • Total Processed: {total_updated + total_skipped + total_errors}")
+                if self.first_search_at is not None:
+                    self.console.info(f"  • Time to first search: {self.first_search_at:.1f}s")
                 
                 if self.logger:
                     self.logger.info("="*80)
@@ -120,14 +172,86 @@ class ScraperController:
                     self.logger.info("="*80)
             
         except KeyboardInterrupt:
-            print("\n\n⚠ Process interrupted by user")
+            self.console.warning("\n\n⚠ Process interrupted by user")
         except Exception as e:
-            print(f"✗ Fatal error processing {self.excel_path}: {e}")
-            traceback.print_exc()
+            self.console.error(f"✗ Fatal error processing {self.excel_path}: {e}", exc_info=True)
         finally:
+            self.close()
+
+    def load_history(self, log_file=None):
+        """Row statuses from the latest earlier log of this workbook (LogParser)"""
+        # We need to find logs for BOTH the 'file_updated' name and the original 'file' name
+        # to have a complete history.
+
+        # Strategy: LogParser now takes the current path.
+        # But if we just switched to _updated, we might miss logs from the original run.
+        # Simpler: The LogParser currently matches 'stem_*'.
+        # file_updated matches file_updated_*.
+        # file matches file_*.
+
+        # If we switched to file_updated, we only see file_updated logs.
+        # This is acceptable if we assume the user's workflow is linear.
+        latest_log = LogParser.find_latest_log_for_excel(self.excel_path, exclude=log_file)
+        previous_statuses = {}
+        if latest_log:
+            self.console.info(f"ℹ Found previous log: {os.path.basename(latest_log)}")
+            previous_statuses = LogParser.parse_log_file(latest_log)
+            self.console.info(f"ℹ Loaded {len(previous_statuses)} previous statuses.")
+        else:
+            self.console.info("ℹ No previous log found. Starting fresh.")
+        return previous_statuses
+
+    def plan_rows(self, sheets=None):
+        """{sheet_name: [row dicts]} for the sheets to process, read ahead of the first search"""
+        sheet_names = self.excel_repo.get_sheet_names()
+        if sheets is not None:
+            sheet_names = [name for name in sheet_names if name in sheets]
+        return {name: list(self.excel_repo.get_students_from_sheet(name)) for name in sheet_names}
+
+    def _timed(self, step, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.startup_times[step] = time.perf_counter() - started
+
+    def _report_startup(self):
+        ready = time.perf_counter() - self.run_started
+        steps = " | ".join(f"{step} {seconds:.1f}s" for step, seconds in self.startup_times.items())
+        self.console.info(f"⏱ Startup: {steps} → ready in {ready:.1f}s")
+        if self.logger:
+            self.logger.info(
+                f"STARTUP | {steps} | ready in {ready:.1f}s",
+                extra={'fields': {'event': 'startup', 'ready': round(ready, 3),
+                                  'steps': {k: round(v, 3) for k, v in self.startup_times.items()}}}
+            )
+
+    def setup_logging(self):
+        """Log files and candidate archive for this run; starts the time-to-first-search clock"""
+        self.run_started = time.perf_counter()
+        self.first_search_at = None
+        log_file, self.logger = self.logger_view.setup_logging()
+        self.matcher.logger = self.logger
+        if self.archive_dir:
+            self.archive = CandidateArchive.for_workbook(self.excel_path, self.target_class, self.archive_dir)
+        return log_file
+
+    def close(self):
+        """Persist caches/archive/recording and release (or hand back) the browser"""
+        self.excel_repo.checkpoint()  # delta mode: nothing already matched is lost on interrupt
+        self.identity_cache.save()
+        if self.archive and self.archive.records:
+            self.archive.close()
+            self.console.info(f"🗄 Candidates archived to: {self.archive.path}")
+        if self.recording:
+            self.console.info(f"📼 Portal responses recorded to: {self.recording.save()}")
+        if self.owns_browser:
             self.browser_manager.close()
+        else:
+            self.browser_manager.reset(self.portal_url)
+        self.logger_view.close()
 
-    def process_sheet(self, sheet_name, previous_statuses):
+    def process_sheet(self, sheet_name, previous_statuses, rows=None):
         updated_count = 0
         skipped_count = 0
         error_count = 0
@@ -135,7 +259,9 @@ class ScraperController:
         # We need a generator or list from the repo
         # The repo method assumes existing logic of iterating rows
         
-        for student_data in self.excel_repo.get_students_from_sheet(sheet_name):
+        if rows is None:
+            rows = self.excel_repo.get_students_from_sheet(sheet_name)
+        for student_data in rows:
             row_idx = student_data['row_idx']
             student_name = student_data['name']
             current_admission = student_data['current_admission']
@@ -144,11 +270,11 @@ class ScraperController:
             if not student_name or student_name == "NAME":
                 continue
             
-            print(f"\nRow {row_idx}: {student_name}")
+            self.console.info(f"\nRow {row_idx}: {student_name}")
             
             # Skip if admission number already exists
             if current_admission and isinstance(current_admission, str) and "CDSSJOS" in current_admission:
-                print(f"  ⊘ Skipped (already has admission number: {current_admission})")
+                self.console.info(f"  ⊘ Skipped (already has admission number: {current_admission})")
                 skipped_count += 1
                 continue
             
@@ -156,114 +282,190 @@ class ScraperController:
             log_status = previous_statuses.get(row_idx)
             
             if log_status == LogParser.STATUS_INFO:
-                print(f"  ⏭ Skipped (Previously Matched - INFO)")
+                self.console.info(f"  ⏭ Skipped (Previously Matched - INFO)")
                 skipped_count += 1
                 continue
             
             elif log_status == LogParser.STATUS_WARNING:
-                print(f"  ⚠ Re-checking (Previous Low Confidence - WARNING)")
+                self.console.info(f"  ⚠ Re-checking (Previous Low Confidence - WARNING)")
                 # Proceed to search code below...
                 
             elif log_status == LogParser.STATUS_ERROR:
-                print(f"  ↻ Retrying with Smart Matching (Previous Error)")
+                self.console.info(f"  ↻ Retrying with Smart Matching (Previous Error)")
                 # Proceed to search code + enable smart permutation retry
             
-            # Clean and search
-            search_name = clean_name(student_name)
-            
-            if not search_name:
-                print(f"  ⊘ Skipped (couldn't parse name)")
+            source, best_match, score = self.match_row(sheet_name, row_idx, student_name)
+
+            if source == ROW_UNPARSED:
+                self.console.info(f"  ⊘ Skipped (couldn't parse name)")
                 skipped_count += 1
                 continue
-            
-            # --- Standard Search ---
-            portal_results = self.portal_repo.search_students(search_name)
-            best_match, score = self.matcher.find_best_match(student_name, portal_results)
-            
-            # --- Smart Retry Loop (if no good match) ---
-            if (not best_match or score < 0.45):
-                print(f"    ... Standard search failed. Trying individual name components...")
-                search_terms = self.smart_matcher.generate_search_terms(student_name)
-                
-                for term in search_terms:
-                    if term.lower() == search_name.lower(): continue # Skip what we just did
-                    
-                    print(f"    ? Trying: {term}")
-                    term_results = self.portal_repo.search_students(term)
-                    
-                    # IMPORTANT: We match against the ORIGINAL FULL NAME logic from Excel,
-                    # but using the new results found by the single key term.
-                    term_match, term_score = self.matcher.find_best_match(student_name, term_results)
-                    
-                    if term_match and term_score >= 0.70: # High threshold for safety
-                        best_match = term_match
-                        score = term_score
-                        search_name = term # Update for logging what actually worked
-                        print(f"    ✓ Smart Match found via '{term}'!")
-                        break
-                        
-            # Log results (logic was in search_student in original)
-            self._log_match_result(student_name, best_match, score, row_idx, search_name)
+            if source == ROW_TIMEOUT:
+                error_count += 1
+                continue
 
             if best_match:
                 # User requested updating even if low confidence
-                if score < 0.45:
-                    print(f"  ⚠ Forced Update (Low Confidence: {score:.0%})")
-                
-                admission_number, display_name = best_match
-                self.excel_repo.update_student(sheet_name, row_idx, admission_number)
+                if score < 0.45 and source == ROW_SEARCHED:
+                    self.console.info(f"  ⚠ Forced Update (Low Confidence: {score:.0%})")
+
+                self.excel_repo.update_student(sheet_name, row_idx, best_match[0], score)
                 updated_count += 1
-                
-                if score >= 0.45:
-                    print(f"  ✓ Updated in Excel")
+
+                if source == ROW_CACHED:
+                    self.console.info(f"  ✓ Updated in Excel (from identity cache)")
+                elif score >= 0.45:
+                    self.console.info(f"  ✓ Updated in Excel")
             else:
                 error_count += 1
-                
-            time.sleep(1) # Delay
-            
-        print(f"\n{'-'*70}")
-        print(f"Sheet Summary ({sheet_name}):")
-        print(f"  • Updated: {updated_count}")
-        print(f"  • Skipped: {skipped_count}")
-        print(f"  • Errors: {error_count}")
-        print(f"{'-'*70}")
+
+            if source == ROW_SEARCHED:
+                # Pacing between requests is handled by the rate controller
+                self.rate_controller.row_done()
+                if self.rate_controller.rows_done % 10 == 0:
+                    self.console.info(f"  ⏱ {self.rate_controller.status()} | {self.watchdog.status()}")
+
+        self.console.info(f"\n{'-'*70}")
+        self.console.info(f"Sheet Summary ({sheet_name}):")
+        self.console.info(f"  • Updated: {updated_count}")
+        self.console.info(f"  • Skipped: {skipped_count}")
+        self.console.info(f"  • Errors: {error_count}")
+        self.console.info(f"  • Pace: {self.rate_controller.status()}")
+        self.console.info(f"  • Browser: {self.watchdog.status()}")
+        self.console.info(f"{'-'*70}")
 
         return updated_count, skipped_count, error_count
 
-    def _log_match_result(self, full_name, best_match, best_score, row_idx, search_name):
+    def match_row(self, sheet_name, row_idx, student_name):
+        """
+        Find the admission number for one Excel row: identity cache first, then
+        the standard search + smart retry (archived and logged like any row).
+        Returns (source, best_match, score); source is one of the ROW_* values.
+        """
+        self.row_pages = 0
+
+        # Resolved before (in this or another workbook)? No portal search needed.
+        cached = self.identity_cache.get(student_name, self.target_class)
+        if cached:
+            best_match = (cached['admission'], cached['portal_name'])
+            self._log_match_result(student_name, best_match, cached['score'], row_idx, "identity cache", sheet_name)
+            if self.archive:
+                self.archive.add(sheet_name, row_idx, student_name, [], best_match, cached['score'], cached=True)
+            return ROW_CACHED, best_match, cached['score']
+
+        # Clean and search
+        if not clean_name(student_name):
+            return ROW_UNPARSED, None, 0
+
+        # Standard search + smart retry; every search is kept for the candidate archive.
+        # A paginated result list is walked only until a confident candidate shows up.
+        def good_enough(rows):
+            return self.matcher.find_best_match(student_name, rows)[1] >= SMART_MATCH_THRESHOLD
+
+        def search(term):
+            results = self._search(term, stop_when=good_enough)
+            searches.append((term, results))
+            return results
+
+        for attempt in range(1, self.ROW_ATTEMPTS + 1):
+            searches = []
+            try:
+                best_match, score, search_name = self.resolver.resolve(student_name, search)
+                break
+            except OperationTimeout as e:
+                self.console.warning(f"  ↻ Row {row_idx}: browser hung (attempt {attempt}/{self.ROW_ATTEMPTS}): {e}")
+        else:
+            if self.logger:
+                self.logger.error(
+                    f"TIMEOUT | Row {row_idx} | Excel: {student_name} | Browser hung on every attempt",
+                    extra={'fields': {'sheet': sheet_name, 'row': row_idx, 'excel_name': student_name,
+                                      'event': 'timeout'}}
+                )
+            return ROW_TIMEOUT, None, 0
+
+        if self.archive:
+            self.archive.add(
+                sheet_name, row_idx, student_name, searches, best_match, score,
+                terms=self.resolver.last_terms
+            )
+
+        # Log results (logic was in search_student in original)
+        self._log_match_result(student_name, best_match, score, row_idx, search_name, sheet_name)
+
+        if best_match:
+            admission_number, display_name = best_match
+            self.identity_cache.put(
+                student_name, self.target_class, admission_number, score, display_name,
+                source=os.path.basename(self.excel_path)
+            )
+        return ROW_SEARCHED, best_match, score
+
+    def _search(self, term, stop_when=None):
+        """Portal search, answered from the shared search cache when possible"""
+        results = self.search_cache.get(self.target_class, term, accept_partial=stop_when)
+        if results is None:
+            if self.first_search_at is None and self.run_started is not None:
+                self.first_search_at = time.perf_counter() - self.run_started
+            results = self.watchdog.search(self.portal_repo.search_students, term, stop_when=stop_when)
+            last = self.portal_repo.last_search
+            self.row_pages += last['pages']
+            self.search_cache.put(self.target_class, term, results, complete=last['complete'])
+        self.token_stats.observe(results)
+        return results
+
+    def _log_match_result(self, full_name, best_match, best_score, row_idx, search_name, sheet_name=None):
         if not self.logger: return
+
+        # Structured copy of the record for the JSON lines log
+        fields = {
+            'sheet': sheet_name,
+            'row': row_idx,
+            'excel_name': full_name,
+            'score': round(best_score, 4),
+            'search': search_name,
+            'pages': self.row_pages,
+        }
         
         if best_match:
             admission, portal_name = best_match
+            fields.update({'admission': admission, 'portal_name': portal_name})
             
             if best_score >= 0.70:
+                fields['event'] = 'matched'
                 self.logger.info(
                     f"MATCHED | Row {row_idx} | "
                     f"Excel: {full_name} | Portal: {portal_name} | "
-                    f"Admission: {admission} | Score: {best_score:.2%}"
+                    f"Admission: {admission} | Score: {best_score:.2%}",
+                    extra={'fields': fields}
                 )
-                print(f" ✓ Best match: {portal_name} → {admission}")
+                self.console.info(f" ✓ Best match: {portal_name} → {admission}")
                 
             elif 0.45 <= best_score < 0.70:
+                fields['event'] = 'low_confidence'
                 self.logger.warning(
                     f"LOW CONFIDENCE | Row {row_idx} | "
                     f"Excel: {full_name} | Portal: {portal_name} | "
-                    f"Admission: {admission} | Score: {best_score:.2%}"
+                    f"Admission: {admission} | Score: {best_score:.2%}",
+                    extra={'fields': fields}
                 )
-                print(f" ⚠ LOW CONFIDENCE MATCH ({best_score:.0%}) - Please verify!")
+                self.console.info(f" ⚠ LOW CONFIDENCE MATCH ({best_score:.0%}) - Please verify!")
                 
             else:
                 # Very low confidence but forcing update as requested
+                fields['event'] = 'forced_update'
                 self.logger.warning(
                     f"FORCED UPDATE (VERY LOW CONFIDENCE) | Row {row_idx} | "
                     f"Excel: {full_name} | Portal: {portal_name} | "
-                    f"Admission: {admission} | Score: {best_score:.2%}"
+                    f"Admission: {admission} | Score: {best_score:.2%}",
+                    extra={'fields': fields}
                 )
-                print(f" ⚠ VERY LOW CONFIDENCE ({best_score:.0%}) - Updating anyway!")
+                self.console.info(f" ⚠ VERY LOW CONFIDENCE ({best_score:.0%}) - Updating anyway!")
                 
         else:
+            fields['event'] = 'no_match'
             self.logger.error(
                 f"NO MATCH | Row {row_idx} | "
                 f"Excel: {full_name} | Best score: {best_score:.2%} | "
-                f"Searched: {search_name}"
+                f"Searched: {search_name}",
+                extra={'fields': fields}
             )
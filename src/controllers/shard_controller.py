@@ -0,0 +1,99 @@
+import time
+
+from src.controllers.scraper_controller import ScraperController, ROW_SEARCHED, ROW_TIMEOUT
+from src.models.excel_repository import ExcelRepository
+from src.models.batch_manifest import updated_path_for
+from src.models.work_shard import WorkShard, ShardResults, DEFAULT_SHARD_DIR
+from src.views.logger_view import get_console
+
+class ShardController:
+    """`shard`: split a workbook's pending rows into N work manifests for `run-shard`"""
+
+    def __init__(self, excel_path, shards, out_dir=DEFAULT_SHARD_DIR, target_class=None):
+        self.excel_path = updated_path_for(excel_path)
+        self.shards = shards
+        self.out_dir = out_dir
+        self.target_class = target_class
+        self.console = get_console()
+
+    def run(self):
+        excel_repo = ExcelRepository(self.excel_path)
+        if not excel_repo.load():
+            return []
+
+        shards = WorkShard.split_workbook(excel_repo, self.shards, self.target_class)
+        paths = [shard.save(self.out_dir) for shard in shards]
+
+        total = sum(len(shard.rows) for shard in shards)
+        self.console.info(f"\n✓ Split {total} pending rows of {self.excel_path} into {len(paths)} shards:")
+        for shard, path in zip(shards, paths):
+            self.console.info(f"  • {path} ({len(shard.rows)} rows)")
+        return paths
+
+
+class ShardRunController:
+    """
+    `run-shard`: resolve one shard's rows against the portal (or a replay fixture)
+    and write them to its results file. Matching, caches, logs and the candidate
+    archive are exactly those of a normal run (ScraperController.match_row).
+    """
+
+    def __init__(self, shard_path, portal_url, username, password, out_dir=DEFAULT_SHARD_DIR, **controller_options):
+        self.shard = WorkShard.load(shard_path)
+        self.results = ShardResults.for_shard(self.shard, out_dir)
+        # Logs and archives are named after the shard, e.g. logs/JSS1.shard-02-of-04_<ts>.log
+        self.controller = ScraperController(
+            f"{self.shard.name}.xlsx", portal_url, username, password,
+            target_class=self.shard.target_class, **controller_options
+        )
+        self.console = get_console()
+
+    def run(self):
+        controller = self.controller
+        counts = {'matched': 0, 'no_match': 0, 'timeout': 0, 'resumed': len(self.results.done)}
+        started = time.perf_counter()
+
+        controller.setup_logging()
+        try:
+            if not controller.watchdog.start_session():
+                self.console.error(f"\n✗ Failed to login. Shard {self.shard.name} not processed.")
+                return None
+
+            if counts['resumed']:
+                self.console.info(f"ℹ Resuming: {counts['resumed']} rows already in {self.results.path}")
+
+            for row in self.shard.rows:
+                if (row['sheet'], row['row']) in self.results.done:
+                    continue
+
+                self.console.info(f"\n{row['sheet']} Row {row['row']}: {row['name']}")
+                source, best_match, score = controller.match_row(row['sheet'], row['row'], row['name'])
+
+                if source == ROW_TIMEOUT:
+                    # Left out of the results file: a rerun of the shard picks it up
+                    counts['timeout'] += 1
+                    continue
+
+                self.results.add(row, best_match, score, source)
+                counts['matched' if best_match else 'no_match'] += 1
+                if source == ROW_SEARCHED:
+                    controller.rate_controller.row_done()
+
+        except KeyboardInterrupt:
+            self.console.warning("\n\n⚠ Shard interrupted by user (finished rows are kept; rerun to continue)")
+        except Exception as e:
+            self.console.error(f"✗ Fatal error processing shard {self.shard.name}: {e}", exc_info=True)
+        finally:
+            self.results.close()
+            controller.close()
+
+        self.console.info(f"\n{'='*70}")
+        self.console.info(f"SHARD {self.shard.index}/{self.shard.count} DONE in {time.perf_counter() - started:.1f}s")
+        self.console.info(f"{'='*70}")
+        self.console.info(f"  • Matched: {counts['matched']}")
+        self.console.info(f"  • No match: {counts['no_match']}")
+        self.console.info(f"  • Browser timeouts (rerun to retry): {counts['timeout']}")
+        if counts['resumed']:
+            self.console.info(f"  • Done in an earlier run: {counts['resumed']}")
+        self.console.info(f"  → Results: {self.results.path}")
+        return self.results.path
@@ -0,0 +1,33 @@
+from src.models.batch_manifest import updated_path_for
+from src.models.excel_repository import ExcelRepository
+from src.models.update_sidecar import UpdateSidecar, sidecar_path_for
+from src.views.logger_view import get_console
+
+class UpdatesController:
+    """`apply-updates`: patch a delta run's sidecar file into the workbook (one full save)"""
+
+    def __init__(self, excel_path, keep=False):
+        self.excel_path = updated_path_for(excel_path)
+        self.sidecar = UpdateSidecar(sidecar_path_for(excel_path))
+        self.keep = keep
+        self.console = get_console()
+
+    def apply(self):
+        if not self.sidecar.exists():
+            self.console.info(f"ℹ No pending updates for {self.excel_path} ({self.sidecar.path} not found)")
+            return None
+
+        changes = self.sidecar.read()
+        excel_repo = ExcelRepository(self.excel_path)
+        if not excel_repo.load():
+            return None
+
+        applied = excel_repo.apply_changes(changes.values())
+        output_path = excel_repo.save()
+        if not output_path:
+            return None
+
+        if not self.keep:
+            self.sidecar.remove()
+        self.console.info(f"✓ Applied {applied} updates from {self.sidecar.path}: {output_path}")
+        return output_path
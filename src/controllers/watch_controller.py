@@ -0,0 +1,234 @@
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.controllers.scraper_controller import ScraperController
+from src.services.browser_manager import BrowserManager
+from src.services.rate_controller import AdaptiveRateController
+from src.services.search_cache import SearchCache
+from src.models.identity_cache import IdentityCache
+from src.models.token_stats import TokenStats
+from src.controllers.roster_controller import DEFAULT_ROSTER_PATH
+from src.views.logger_view import get_console
+
+MAX_JOB_HISTORY = 50
+
+class WatchController:
+    """
+    Daemon mode: watches a folder and processes new or modified workbooks as they arrive.
+
+    The browser, its logged-in session, the search cache and the rate controller
+    live for the whole daemon, so each job only pays for its own matching work.
+    A file is queued once its size/mtime stayed the same for one poll (so
+    half-copied files are not picked up); our own `_updated` outputs are ignored.
+    """
+
+    def __init__(self, directory, portal_url, username, password, pattern="*.xlsx",
+                 target_class=None, max_rate=20, profile_dir=None, interval=10,
+                 status_path=None, status_port=None):
+        self.directory = Path(directory)
+        self.portal_url = portal_url
+        self.username = username
+        self.password = password
+        self.pattern = pattern
+        self.target_class = target_class
+        self.interval = interval
+        self.status_path = status_path or str(self.directory / ".scraper_status.json")
+        self.status_port = status_port
+
+        # Warm state shared by every job
+        self.browser_manager = BrowserManager(user_data_dir=profile_dir)
+        self.search_cache = SearchCache()
+        self.identity_cache = IdentityCache()
+        self.rate_controller = AdaptiveRateController(max_rate=max_rate)
+        self.token_stats = TokenStats.for_roster_file(DEFAULT_ROSTER_PATH)
+
+        self.jobs = queue.Queue()
+        self._queued = set()
+        self._seen = {}       # path -> (mtime, size) last scanned
+        self._done = {}       # path -> (mtime, size) when last processed
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.current = None
+        self.history = []
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.console = get_console()
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _candidates(self):
+        for file_path in glob.glob(str(self.directory / self.pattern)):
+            name = os.path.basename(file_path)
+            if '_updated' in name or name.startswith('~$'):
+                continue
+            yield file_path
+
+    def _already_processed(self, file_path):
+        """At startup: a file whose _updated output is newer than it needs no work"""
+        updated_path = file_path.replace('.xlsx', '_updated.xlsx')
+        return os.path.exists(updated_path) and os.path.getmtime(updated_path) >= os.path.getmtime(file_path)
+
+    def scan(self, initial=False):
+        """Queue files that are new or changed and have stopped changing"""
+        for file_path in self._candidates():
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            signature = (stat.st_mtime, stat.st_size)
+
+            if initial:
+                self._seen[file_path] = signature
+                if self._already_processed(file_path):
+                    self._done[file_path] = signature
+                    continue
+
+            stable = self._seen.get(file_path) == signature
+            self._seen[file_path] = signature
+            if not stable and not initial:
+                continue
+
+            with self._lock:
+                if self._done.get(file_path) == signature or file_path in self._queued:
+                    continue
+                self._queued.add(file_path)
+            self.jobs.put((file_path, signature, time.time()))
+            self.console.info(f"📥 Queued: {os.path.basename(file_path)}")
+        self.write_status()
+
+    def _scan_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.scan()
+            except Exception as e:
+                self.console.warning(f"⚠ Folder scan failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def status(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'directory': str(self.directory),
+                'state': 'processing' if self.current else 'idle',
+                'current': self.current,
+                'queue_depth': self.jobs.qsize(),
+                'queued': sorted(os.path.basename(p) for p in self._queued if p != (self.current or {}).get('path')),
+                'search_cache': {
+                    'entries': len(self.search_cache),
+                    'hits': self.search_cache.hits,
+                    'misses': self.search_cache.misses,
+                },
+                'rate': self.rate_controller.status(),
+                'jobs': list(self.history),
+            }
+
+    def write_status(self):
+        tmp_path = f"{self.status_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.status(), f, indent=2)
+            os.replace(tmp_path, self.status_path)
+        except OSError as e:
+            self.console.warning(f"⚠ Could not write status file: {e}")
+
+    def _serve_status(self):
+        controller = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(controller.status(), indent=2).encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", self.status_port), StatusHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.console.info(f"🌐 Status endpoint: http://127.0.0.1:{self.status_port}/status")
+        return server
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def _run_job(self, file_path, signature, queued_at):
+        started = time.time()
+        with self._lock:
+            self.current = {
+                'path': file_path,
+                'file': os.path.basename(file_path),
+                'started_at': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+            }
+        self.write_status()
+
+        self.console.info(f"\n{'#'*70}")
+        self.console.info(f">>> JOB: {file_path} (queue: {self.jobs.qsize()} waiting)")
+        self.console.info(f"{'#'*70}")
+
+        controller = ScraperController(
+            file_path,
+            self.portal_url,
+            self.username,
+            self.password,
+            target_class=self.target_class,
+            browser_manager=self.browser_manager,
+            search_cache=self.search_cache,
+            rate_controller=self.rate_controller,
+            identity_cache=self.identity_cache,
+            token_stats=self.token_stats
+        )
+        controller.run()
+
+        finished = time.time()
+        with self._lock:
+            self._queued.discard(file_path)
+            self._done[file_path] = signature
+            self.current = None
+            self.history.append({
+                'file': os.path.basename(file_path),
+                'queued_at': datetime.fromtimestamp(queued_at).isoformat(timespec='seconds'),
+                'waited_seconds': round(started - queued_at, 1),
+                'run_seconds': round(finished - started, 1),
+            })
+            del self.history[:-MAX_JOB_HISTORY]
+        self.write_status()
+        self.console.info(f"⏱ Job done in {finished - started:.1f}s")
+
+    def run(self):
+        self.console.info(f"\n👀 Watching {self.directory} for '{self.pattern}' (every {self.interval}s)")
+        self.console.info(f"   Status file: {self.status_path}  |  Ctrl+C to stop")
+
+        server = self._serve_status() if self.status_port else None
+        self.scan(initial=True)
+        scanner = threading.Thread(target=self._scan_loop, daemon=True)
+        scanner.start()
+
+        try:
+            while True:
+                try:
+                    file_path, signature, queued_at = self.jobs.get(timeout=1)
+                except queue.Empty:
+                    continue
+                self._run_job(file_path, signature, queued_at)
+        except KeyboardInterrupt:
+            self.console.warning("\n\n⚠ Watch mode stopped by user")
+        finally:
+            self._stop.set()
+            if server:
+                server.shutdown()
+            self.browser_manager.close()
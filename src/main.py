@@ -1,15 +1,428 @@
 import argparse
 import glob
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from src.controllers.scraper_controller import ScraperController
+from src.controllers.roster_controller import RosterController, DEFAULT_ROSTER_PATH
+from src.controllers.watch_controller import WatchController
+from src.controllers.rescore_controller import RescoreController, load_scorer
+from src.controllers.rematch_controller import RematchController
+from src.controllers.shard_controller import ShardController, ShardRunController
+from src.controllers.merge_controller import MergeController
+from src.controllers.updates_controller import UpdatesController
+from src.models.work_shard import DEFAULT_SHARD_DIR
+from src.models.student_matcher import MATCH_THRESHOLD, SMART_MATCH_THRESHOLD, SPELLING_VARIANT_THRESHOLD
+from src.services.browser_manager import BrowserManager
+from src.services.rate_controller import AdaptiveRateController
+from src.services.search_cache import SearchCache
+from src.models.identity_cache import IdentityCache, DEFAULT_IDENTITY_CACHE_PATH
+from src.models.token_stats import TokenStats
+from src.models.batch_manifest import BatchManifest, sheet_fingerprints, updated_path_for
+from src.services.portal_recorder import PortalRecording, ReplayBackend, REPLAY_LATENCY_RECORDED
+from src.views.logger_view import (
+    configure_console, get_console, VERBOSITY_QUIET, VERBOSITY_NORMAL, VERBOSITY_VERBOSE
+)
+
+def replay_latency(value):
+    """argparse type for --replay-latency: seconds, or 'recorded'"""
+    if value == REPLAY_LATENCY_RECORDED:
+        return value
+    return float(value)
+
+def positive_rate(value):
+    """argparse type for --max-rate: requests per minute, above zero"""
+    rate = float(value)
+    if rate <= 0:
+        raise argparse.ArgumentTypeError(f"must be above 0 requests/minute, got {value}")
+    return rate
+
+def add_verbosity_arguments(parser):
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="Only show warnings and errors on the console"
+    )
+    verbosity.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Also show every portal candidate with its match score"
+    )
+
+def apply_verbosity(args):
+    if args.quiet:
+        configure_console(VERBOSITY_QUIET)
+    elif args.verbose:
+        configure_console(VERBOSITY_VERBOSE)
+    else:
+        configure_console(VERBOSITY_NORMAL)
+
+def load_credentials():
+    """Returns (PORTAL_URL, USERNAME, PASSWORD) from .env, or None if any is missing"""
+    load_dotenv()
+
+    PORTAL_URL = os.getenv("PORTAL_URL")
+    USERNAME = os.getenv("PORTAL_USER")
+    PASSWORD = os.getenv("PORTAL_PASS")
+    
+    # Validate environment variables
+    if not all([PORTAL_URL, USERNAME, PASSWORD]):
+        console = get_console()
+        console.error("✗ Error: Missing environment variables!")
+        console.error("  Please ensure your .env file contains:")
+        console.error("    PORTAL_URL=https://...")
+        console.error("    PORTAL_USER=your_username")
+        console.error("    PORTAL_PASS=your_password")
+        return None
+
+    return PORTAL_URL, USERNAME, PASSWORD
+
+def sync_roster(argv):
+    """`sync-roster` command: refresh the local roster with only what changed on the portal"""
+    parser = argparse.ArgumentParser(
+        prog="sync-roster",
+        description="Fetch students added/changed/removed since the last sync into the local roster"
+    )
+    parser.add_argument(
+        "--roster",
+        default=DEFAULT_ROSTER_PATH,
+        help=f"Local roster file (default: {DEFAULT_ROSTER_PATH})"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-read every page (also detects changed and removed students)"
+    )
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    apply_verbosity(args)
+
+    credentials = load_credentials()
+    if not credentials:
+        return
+
+    PORTAL_URL, USERNAME, PASSWORD = credentials
+    RosterController(PORTAL_URL, USERNAME, PASSWORD, roster_path=args.roster).run(full=args.full)
+
+def watch(argv):
+    """`watch` command: daemon that processes workbooks dropped into a folder"""
+    parser = argparse.ArgumentParser(
+        prog="watch",
+        description="Watch a folder and process new or modified Excel files with a warm browser session"
+    )
+    parser.add_argument("directory", help="Folder to watch")
+    parser.add_argument(
+        "--pattern",
+        default="*.xlsx",
+        help="File pattern to match (default: *.xlsx)"
+    )
+    parser.add_argument(
+        "--class",
+        dest="student_class",
+        default=None,
+        help="Filter by class (e.g., 'JSS 3', 'SS 3') - speeds up search"
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=positive_rate,
+        default=20,
+        help="Ceiling on portal searches per minute (default: 20)"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=None,
+        help="Persistent Chrome profile directory (e.g. cache/chrome-profile)"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=10,
+        help="Seconds between folder scans (default: 10)"
+    )
+    parser.add_argument(
+        "--status-file",
+        default=None,
+        help="Where to write the JSON status (default: <directory>/.scraper_status.json)"
+    )
+    parser.add_argument(
+        "--status-port",
+        type=int,
+        default=None,
+        help="Also serve the status as JSON on http://127.0.0.1:<port>/status"
+    )
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    apply_verbosity(args)
+    console = get_console()
+
+    if not Path(args.directory).is_dir():
+        console.error(f"✗ Not a directory: {args.directory}")
+        return
+
+    credentials = load_credentials()
+    if not credentials:
+        return
+
+    PORTAL_URL, USERNAME, PASSWORD = credentials
+    WatchController(
+        args.directory, PORTAL_URL, USERNAME, PASSWORD,
+        pattern=args.pattern,
+        target_class=args.student_class,
+        max_rate=args.max_rate,
+        profile_dir=args.profile_dir,
+        interval=args.interval,
+        status_path=args.status_file,
+        status_port=args.status_port
+    ).run()
+
+def rescore(argv):
+    """`rescore` command: re-run matching over an archived run with other thresholds/scorer"""
+    parser = argparse.ArgumentParser(
+        prog="rescore",
+        description="Re-score an archived run (archives/*.jsonl.gz) offline, without the browser"
+    )
+    parser.add_argument("archive", help="Candidate archive written by a previous run")
+    parser.add_argument(
+        "--match",
+        type=float,
+        default=MATCH_THRESHOLD,
+        help=f"Score below which the smart retry kicks in (default: {MATCH_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--smart",
+        type=float,
+        default=SMART_MATCH_THRESHOLD,
+        help=f"Score a smart-retry match must reach (default: {SMART_MATCH_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--variant",
+        type=float,
+        default=None,
+        help=f"Similarity for a spelling variant to count (default: {SPELLING_VARIANT_THRESHOLD}; "
+             "built-in scorer only)"
+    )
+    parser.add_argument(
+        "--scorer",
+        default=None,
+        help="Alternative scorer class as 'module:ClassName' (must provide find_best_match)"
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Write the changed assignments into the workbook (saved as _updated.xlsx)"
+    )
+    parser.add_argument(
+        "--workbook",
+        default=None,
+        help="Workbook to apply to (default: the one recorded in the archive)"
+    )
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    apply_verbosity(args)
+    if args.scorer and args.variant is not None:
+        parser.error("--variant only applies to the built-in scorer; configure it in the --scorer class")
+
+    controller = RescoreController(
+        args.archive,
+        match_threshold=args.match,
+        smart_threshold=args.smart,
+        scorer=load_scorer(args.scorer, args.variant)
+    )
+    header, changes = controller.rescore()
+
+    if args.apply:
+        controller.apply(changes, args.workbook or header['workbook'])
+
+def rematch(argv):
+    """`rematch` command: match a workbook against the local roster on all CPU cores"""
+    parser = argparse.ArgumentParser(
+        prog="rematch",
+        description="Fill missing admission numbers from the local roster (see sync-roster), without the browser"
+    )
+    parser.add_argument("workbook", help="Excel workbook to match")
+    parser.add_argument(
+        "--roster",
+        default=DEFAULT_ROSTER_PATH,
+        help=f"Local roster file (default: {DEFAULT_ROSTER_PATH})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Matching processes (default: one per CPU core)"
+    )
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=SMART_MATCH_THRESHOLD,
+        help=f"Score a match must reach to be written (default: {SMART_MATCH_THRESHOLD})"
+    )
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    apply_verbosity(args)
+    console = get_console()
+
+    if not os.path.exists(args.roster):
+        console.error(f"✗ Roster not found: {args.roster} (run 'sync-roster' first)")
+        return
+
+    RematchController(
+        args.workbook,
+        args.roster,
+        workers=args.workers,
+        min_score=args.min_score
+    ).run()
+
+def shard(argv):
+    """`shard` command: split a workbook's pending rows into work manifests for several machines"""
+    parser = argparse.ArgumentParser(
+        prog="shard",
+        description="Split a workbook's pending rows into N self-contained shards (process each with run-shard)"
+    )
+    parser.add_argument("workbook", help="Excel workbook to split")
+    parser.add_argument("--shards", type=int, required=True, help="Number of shards")
+    parser.add_argument(
+        "--out",
+        default=DEFAULT_SHARD_DIR,
+        help=f"Directory for the shard files (default: {DEFAULT_SHARD_DIR})"
+    )
+    parser.add_argument(
+        "--class",
+        dest="student_class",
+        default=None,
+        help="Class filter the shards are searched with"
+    )
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    apply_verbosity(args)
+
+    ShardController(args.workbook, args.shards, args.out, args.student_class).run()
+
+def run_shard(argv):
+    """`run-shard` command: resolve one shard against the portal and write its results file"""
+    parser = argparse.ArgumentParser(
+        prog="run-shard",
+        description="Process one shard file and write <shard>.results.jsonl (rerun to continue after an interruption)"
+    )
+    parser.add_argument("shard", help="Shard file written by the shard command")
+    parser.add_argument(
+        "--out",
+        default=DEFAULT_SHARD_DIR,
+        help=f"Directory for the results file (default: {DEFAULT_SHARD_DIR})"
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=positive_rate,
+        default=20,
+        help="Ceiling on portal searches per minute (default: 20)"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=None,
+        help="Persistent Chrome profile directory (use a different one per parallel run-shard)"
+    )
+    parser.add_argument(
+        "--no-identity-cache",
+        action="store_true",
+        help="Do not read or write the identity cache file"
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="FIXTURE",
+        default=None,
+        help="Run offline against a recorded fixture instead of the live portal"
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=replay_latency,
+        default=0.0,
+        help="Simulated seconds per replayed search, or 'recorded' (default: 0)"
+    )
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    apply_verbosity(args)
+
+    options = {'max_rate': args.max_rate}
+    if args.replay:
+        PORTAL_URL, USERNAME, PASSWORD = "replay://portal", None, None
+        options['replay'] = ReplayBackend(args.replay, latency=args.replay_latency)
+    else:
+        credentials = load_credentials()
+        if not credentials:
+            return
+        PORTAL_URL, USERNAME, PASSWORD = credentials
+        options['browser_manager'] = BrowserManager(user_data_dir=args.profile_dir)
+        options['token_stats'] = TokenStats.for_roster_file(DEFAULT_ROSTER_PATH)
+    use_identity_file = not (args.no_identity_cache or args.replay)
+    options['identity_cache'] = IdentityCache(DEFAULT_IDENTITY_CACHE_PATH if use_identity_file else None)
+
+    try:
+        ShardRunController(args.shard, PORTAL_URL, USERNAME, PASSWORD, args.out, **options).run()
+    finally:
+        if 'browser_manager' in options:
+            options['browser_manager'].close()
+
+def merge(argv):
+    """`merge` command: apply the results of every shard to the workbook"""
+    parser = argparse.ArgumentParser(
+        prog="merge",
+        description="Write shard results into one _updated.xlsx, reporting conflicting rows instead of writing them"
+    )
+    parser.add_argument("workbook", help="The workbook the shards were split from")
+    parser.add_argument("results", nargs="+", help="Results files written by run-shard")
+    parser.add_argument(
+        "--prefer-best",
+        action="store_true",
+        help="When shards disagree on a row, write the highest-scoring result instead of skipping it"
+    )
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    apply_verbosity(args)
+
+    MergeController(args.workbook, args.results, prefer_best=args.prefer_best).merge()
+
+def apply_updates(argv):
+    """`apply-updates` command: write a delta run's pending updates into the workbook"""
+    parser = argparse.ArgumentParser(
+        prog="apply-updates",
+        description="Patch the updates recorded by --delta runs (<name>_updates.jsonl) into <name>_updated.xlsx"
+    )
+    parser.add_argument("workbook", nargs="+", help="Workbook(s) whose pending updates to apply")
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the updates file after applying it"
+    )
+    add_verbosity_arguments(parser)
+    args = parser.parse_args(argv)
+    apply_verbosity(args)
+
+    for workbook in args.workbook:
+        UpdatesController(workbook, keep=args.keep).apply()
+
+# Sub-commands, e.g. `python student_portal_scraper.py sync-roster`
+COMMANDS = {
+    "sync-roster": sync_roster,
+    "watch": watch,
+    "rescore": rescore,
+    "rematch": rematch,
+    "shard": shard,
+    "run-shard": run_shard,
+    "merge": merge,
+    "apply-updates": apply_updates,
+}
 
 def main():
     """Main execution function with command-line argument support"""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+
     parser = argparse.ArgumentParser(
         description="Automated Student Portal Scraper",
-        epilog="Example: python script.py /path/to/folder/ --class 'JSS 3'"
+        epilog="Example: python script.py /path/to/folder/ --class 'JSS 3'  "
+               f"| Commands: {', '.join(COMMANDS)} (run '<command> -h' for options)"
     )
     parser.add_argument(
         "path", 
@@ -26,26 +439,100 @@ def main():
         default=None,
         help="Filter by class (e.g., 'JSS 3', 'SS 3') - speeds up search"
     )
+    parser.add_argument(
+        "--max-rate",
+        type=positive_rate,
+        default=20,
+        help="Ceiling on portal searches per minute; the actual pace adapts below it (default: 20)"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=None,
+        help="Persistent Chrome profile directory, keeps portal assets cached between runs "
+             "(e.g. cache/chrome-profile)"
+    )
+    parser.add_argument(
+        "--search-deadline",
+        type=float,
+        default=60,
+        help="Seconds one page of a portal search may take before the browser is restarted; "
+             "waits for the rate limiter don't count (default: 60)"
+    )
+    parser.add_argument(
+        "--recycle-every",
+        type=int,
+        default=400,
+        help="Restart the browser after this many searches, 0 to disable (default: 400)"
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1500,
+        help="Restart the browser when Chrome uses more than this many MB; needs psutil (default: 1500)"
+    )
+    parser.add_argument(
+        "--identity-cache",
+        default=DEFAULT_IDENTITY_CACHE_PATH,
+        help=f"Excel name -> admission number cache shared by all workbooks (default: {DEFAULT_IDENTITY_CACHE_PATH})"
+    )
+    parser.add_argument(
+        "--no-identity-cache",
+        action="store_true",
+        help="Do not read or write the identity cache file (repeats within this batch are still reused)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Process every file in the folder, even ones unchanged and fully resolved since the last run"
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Write only the filled-in cells to <name>_updates.jsonl instead of re-saving the workbook "
+             "(apply them later with 'apply-updates')"
+    )
+    portal_mode = parser.add_mutually_exclusive_group()
+    portal_mode.add_argument(
+        "--record",
+        metavar="FIXTURE",
+        default=None,
+        help="Save every portal answer (logins, class filter, searches) to a fixture file"
+    )
+    portal_mode.add_argument(
+        "--replay",
+        metavar="FIXTURE",
+        default=None,
+        help="Run offline against a recorded fixture instead of the live portal"
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=replay_latency,
+        default=0.0,
+        help="Simulated seconds per replayed search, or 'recorded' (default: 0)"
+    )
+    add_verbosity_arguments(parser)
     args = parser.parse_args()
+    apply_verbosity(args)
+    console = get_console()
 
-    load_dotenv()
-
-    # 2. Get Credentials from .env
-    PORTAL_URL = os.getenv("PORTAL_URL")
-    USERNAME = os.getenv("PORTAL_USER")
-    PASSWORD = os.getenv("PORTAL_PASS")
-    
-    # Validate environment variables
-    if not all([PORTAL_URL, USERNAME, PASSWORD]):
-        print("✗ Error: Missing environment variables!")
-        print("  Please ensure your .env file contains:")
-        print("    PORTAL_URL=https://...")
-        print("    PORTAL_USER=your_username")
-        print("    PORTAL_PASS=your_password")
-        return
+    # 2. Get Credentials from .env (not needed when replaying a recording)
+    replay = None
+    recording = None
+    if args.replay:
+        replay = ReplayBackend(args.replay, latency=args.replay_latency)
+        PORTAL_URL, USERNAME, PASSWORD = "replay://portal", None, None
+        console.info(f"📼 Replaying portal responses from: {args.replay}")
+    else:
+        credentials = load_credentials()
+        if not credentials:
+            return
+        PORTAL_URL, USERNAME, PASSWORD = credentials
+        if args.record:
+            recording = PortalRecording(args.record)
 
     # 3. Determine which files to process
     path = Path(args.path)
+    manifest = None
     
     if path.is_file():
         # Single file provided
@@ -55,40 +542,101 @@ def main():
         pattern = args.pattern
         files_to_process = glob.glob(str(path / pattern))
         if not files_to_process:
-            print(f"✗ No files matching '{pattern}' found in {path}")
+            console.error(f"✗ No files matching '{pattern}' found in {path}")
             return
+        # 'X_updated.xlsx' is picked up through 'X.xlsx' (auto-switch), don't run it twice
+        files_to_process = [
+            f for f in files_to_process
+            if not ('_updated' in f and f.replace('_updated.xlsx', '.xlsx') in files_to_process)
+        ]
+        manifest = BatchManifest(str(path))
     else:
-        print(f"✗ Path does not exist: {path}")
+        console.error(f"✗ Path does not exist: {path}")
         return
+
+    # 3b. Skip workbooks whose relevant columns are unchanged and fully resolved
+    # since their last completed run; for the others, only the sheets that need it.
+    sheets_by_file = {}
+    unchanged = []
+    if manifest:
+        for f in files_to_process:
+            try:
+                fingerprints = sheet_fingerprints(updated_path_for(f))
+            except Exception as e:
+                console.warning(f"⚠ Could not fingerprint {Path(f).name}: {e}")
+                sheets_by_file[f] = None
+                continue
+            todo = fingerprints if args.force else manifest.sheets_to_process(f, fingerprints)
+            if not todo:
+                unchanged.append(f)
+            else:
+                sheets_by_file[f] = None if len(todo) == len(fingerprints) else list(todo)
+        files_to_process = [f for f in files_to_process if f not in unchanged]
     
     # 4. Display files to process
-    print("\n" + "="*70)
-    print("STUDENT PORTAL AUTOMATION SCRIPT")
-    print("="*70)
-    print(f"Files to process: {len(files_to_process)}")
+    console.info("\n" + "="*70)
+    console.info("STUDENT PORTAL AUTOMATION SCRIPT")
+    console.info("="*70)
+    console.info(f"Files to process: {len(files_to_process)}")
     for f in files_to_process:
-        print(f"  • {Path(f).name}")
-    print("="*70 + "\n")
+        sheets = sheets_by_file.get(f)
+        console.info(f"  • {Path(f).name}" + (f"  (changed sheets: {', '.join(sheets)})" if sheets else ""))
+    if unchanged:
+        console.info(f"Unchanged and fully resolved (skipped): {len(unchanged)}")
+        for f in unchanged:
+            console.info(f"  ⏭ {Path(f).name}")
+    console.info("="*70 + "\n")
     
     # 5. Process each file
-    for idx, file_path in enumerate(files_to_process, 1):
-        print(f"\n{'#'*70}")
-        print(f">>> FILE {idx}/{len(files_to_process)}: {file_path}")
-        print(f"{'#'*70}")
-        
-        # Instantiate and run controller
-        controller = ScraperController(
-            file_path, 
-            PORTAL_URL, 
-            USERNAME, 
-            PASSWORD, 
-            target_class=args.student_class
-        )
-        controller.run()
+    # One browser for the whole batch: Chrome starts, and logs in, only once.
+    # Search results and the learned request rate carry over between files too.
+    browser_manager = BrowserManager(user_data_dir=args.profile_dir)
+    search_cache = SearchCache()
+    rate_controller = AdaptiveRateController(max_rate=args.max_rate)
+    # Replayed runs keep their identities in memory so they never touch the real cache
+    use_identity_file = not (args.no_identity_cache or args.replay)
+    identity_cache = IdentityCache(args.identity_cache if use_identity_file else None)
+    # Smart-retry terms are ranked by roster token counts when a local roster exists
+    token_stats = TokenStats() if args.replay else TokenStats.for_roster_file(DEFAULT_ROSTER_PATH)
+    try:
+        for idx, file_path in enumerate(files_to_process, 1):
+            console.info(f"\n{'#'*70}")
+            console.info(f">>> FILE {idx}/{len(files_to_process)}: {file_path}")
+            console.info(f"{'#'*70}")
+            
+            # Instantiate and run controller
+            controller = ScraperController(
+                file_path, 
+                PORTAL_URL, 
+                USERNAME, 
+                PASSWORD, 
+                target_class=args.student_class,
+                browser_manager=browser_manager,
+                recording=recording,
+                replay=replay,
+                search_cache=search_cache,
+                rate_controller=rate_controller,
+                identity_cache=identity_cache,
+                token_stats=token_stats,
+                search_deadline=args.search_deadline,
+                recycle_every=args.recycle_every,
+                memory_limit_mb=args.memory_limit,
+                delta=args.delta
+            )
+            controller.run(sheets=sheets_by_file.get(file_path))
+
+            if manifest is not None and controller.output_path:
+                manifest.record(
+                    file_path, controller.sheet_outcomes,
+                    controller.excel_repo.fingerprints()
+                )
+                manifest.save()
+    finally:
+        browser_manager.close()
     
-    print(f"\n{'='*70}")
-    print("ALL FILES PROCESSED")
-    print(f"{'='*70}\n")
+    console.info(f"\n{'='*70}")
+    console.info("ALL FILES PROCESSED")
+    console.info(f"{'='*70}\n")
 
 if __name__ == "__main__":
     main()
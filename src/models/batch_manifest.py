@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import openpyxl
+
+from src.views.logger_view import get_console
+
+MANIFEST_NAME = ".scraper_manifest.json"
+
+def updated_path_for(excel_path):
+    """The file a run will actually read: its _updated copy if one exists"""
+    if '_updated' not in excel_path:
+        updated_path = excel_path.replace('.xlsx', '_updated.xlsx')
+        if os.path.exists(updated_path):
+            return updated_path
+    return excel_path
+
+def sheet_fingerprints(workbook, start_row=3):
+    """
+    {sheet_name: {'hash', 'pending'}} over the columns the scraper uses
+    (A: admission number, B: name). `pending` counts named rows that still
+    have no admission number. Accepts a path or an open workbook.
+    """
+    wb = openpyxl.load_workbook(workbook, read_only=True) if isinstance(workbook, str) else workbook
+    try:
+        return rows_fingerprints({
+            ws.title: ws.iter_rows(min_row=start_row, max_col=2, values_only=True)
+            for ws in wb.worksheets
+        })
+    finally:
+        if isinstance(workbook, str):
+            wb.close()
+
+def rows_fingerprints(rows_by_sheet):
+    """sheet_fingerprints over rows already read: {sheet_name: iterable of (admission, name)}"""
+    fingerprints = {}
+    for sheet_name, rows in rows_by_sheet.items():
+        digest = hashlib.sha1()
+        pending = 0
+        for admission, name in rows:
+            digest.update(f"{admission!r}\x1f{name!r}\x1e".encode('utf-8'))
+            if name and name != "NAME" and not (isinstance(admission, str) and "CDSSJOS" in admission):
+                pending += 1
+        fingerprints[sheet_name] = {'hash': digest.hexdigest(), 'pending': pending}
+    return fingerprints
+
+class BatchManifest:
+    """
+    Per-directory record of each workbook's sheets as of their last completed run
+    (content hash of columns A/B and the run's outcome). A sheet whose content is
+    unchanged and was left fully resolved needs no browser work at all.
+    """
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.files = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.files = json.load(f).get('files', {})
+            except Exception as e:
+                get_console().warning(f"⚠ Ignoring unreadable manifest {self.path}: {e}")
+
+    def sheets_to_process(self, excel_path, fingerprints):
+        """Sheet names that changed, are new, or were not fully resolved last time"""
+        known = self.files.get(os.path.basename(excel_path), {}).get('sheets', {})
+        todo = []
+        for sheet_name, current in fingerprints.items():
+            last = known.get(sheet_name)
+            if not last or last['hash'] != current['hash'] or not last['resolved']:
+                todo.append(sheet_name)
+        return todo
+
+    def record(self, excel_path, sheet_outcomes, fingerprints):
+        """Store the outcome of a completed run for the sheets it processed"""
+        entry = self.files.setdefault(os.path.basename(excel_path), {'sheets': {}})
+        for sheet_name, outcome in sheet_outcomes.items():
+            fingerprint = fingerprints.get(sheet_name)
+            if not fingerprint:
+                continue
+            entry['sheets'][sheet_name] = {
+                'hash': fingerprint['hash'],
+                'pending': fingerprint['pending'],
+                'resolved': fingerprint['pending'] == 0,
+                'updated': outcome['updated'],
+                'skipped': outcome['skipped'],
+                'errors': outcome['errors'],
+            }
+        entry['completed_at'] = datetime.now().isoformat(timespec='seconds')
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files}, f, indent=1)
+        os.replace(tmp_path, self.path)
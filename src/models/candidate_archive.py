@@ -0,0 +1,101 @@
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+
+class CandidateArchive:
+    """
+    Per-run archive of every row's search terms and the portal rows they returned,
+    so matching can be re-scored offline (see RescoreController) without re-scraping.
+
+    Format: gzip-compressed JSON lines. The first line is a header
+    ({'workbook', 'class', 'created'}), then one record per row:
+      {'sheet', 'row', 'name', 'searches': [[term, [[admission, name], ...]], ...],
+       'terms', 'admission', 'portal_name', 'score', 'cached'}
+    `terms` are the smart-retry terms the run generated for the row, in order
+    (null if it needed no retry), so a rescore retries exactly as the run did.
+    A term searched for several rows is stored in full only when its rows differ
+    from the last ones stored for it (e.g. a result walk that stopped early, then
+    a complete one); other records refer to it with a null row list, meaning
+    "the rows last stored for this term".
+    """
+
+    def __init__(self, path, workbook=None, target_class=None):
+        self.path = path
+        self.workbook = workbook
+        self.target_class = target_class
+        self._file = None
+        self._stored_rows = {}  # term -> rows last written in full
+        self.records = 0
+
+    @classmethod
+    def for_workbook(cls, excel_path, target_class=None, archive_dir="./archives"):
+        """New archive named like the log files: archives/{excel_name}_{timestamp}.jsonl.gz"""
+        Path(archive_dir).mkdir(exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = f"{archive_dir}/{Path(excel_path).stem}_{timestamp}.jsonl.gz"
+        return cls(path, workbook=excel_path, target_class=target_class)
+
+    def _write(self, entry):
+        if self._file is None:
+            self._file = gzip.open(self.path, 'wt', encoding='utf-8')
+            self._file.write(json.dumps({
+                'workbook': self.workbook,
+                'class': self.target_class,
+                'created': datetime.now().isoformat(timespec='seconds'),
+            }) + "\n")
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+    def add(self, sheet_name, row_idx, student_name, searches, best_match, score, cached=False, terms=None):
+        """searches: [(term, portal_rows), ...] in the order they were made"""
+        compact = []
+        for term, rows in searches:
+            pairs = [[r['admission'], r['name']] for r in rows]
+            if self._stored_rows.get(term) == pairs:
+                compact.append([term, None])
+            else:
+                self._stored_rows[term] = pairs
+                compact.append([term, pairs])
+
+        self._write({
+            'sheet': sheet_name,
+            'row': row_idx,
+            'name': student_name,
+            'searches': compact,
+            'terms': terms,
+            'admission': best_match[0] if best_match else None,
+            'portal_name': best_match[1] if best_match else None,
+            'score': round(score, 4),
+            'cached': cached,
+        })
+        self.records += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def read(path):
+        """
+        Returns (header, records, results_by_term). Each record's 'searches' is
+        restored to [(term, rows)] exactly as that row saw them; results_by_term
+        holds the longest row list seen per term (a complete walk over a partial one).
+        """
+        latest = {}
+        results_by_term = {}
+        records = []
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            for line in f:
+                record = json.loads(line)
+                searches = []
+                for term, rows in record['searches']:
+                    if rows is not None:
+                        latest[term] = [{'admission': a, 'name': n} for a, n in rows]
+                        if len(latest[term]) >= len(results_by_term.get(term, [])):
+                            results_by_term[term] = latest[term]
+                    searches.append((term, latest.get(term, [])))
+                record['searches'] = searches
+                records.append(record)
+        return header, records, results_by_term
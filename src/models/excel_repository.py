@@ -1,43 +1,148 @@
 import openpyxl
 from openpyxl.styles import PatternFill
 
+from src.models.batch_manifest import sheet_fingerprints, rows_fingerprints
+from src.models.update_sidecar import UpdateSidecar, sidecar_path_for
+from src.views.logger_view import get_console
+
 class ExcelRepository:
-    def __init__(self, file_path):
+    """
+    Reads student rows from a workbook and writes admission numbers back.
+
+    In delta mode the workbook is only read (read-only, streaming): columns A/B
+    are read once and the file is closed again right away. save() appends the
+    changed cells to a sidecar file (see UpdateSidecar) instead of rewriting the
+    workbook; changes already in the sidecar are overlaid on reads.
+    """
+
+    CHECKPOINT_EVERY = 25  # delta mode: changes buffered before they are appended to the sidecar
+
+    def __init__(self, file_path, delta=False):
         self.file_path = file_path
         self.wb = None
+        self.delta = delta
+        self.sidecar = UpdateSidecar(sidecar_path_for(file_path)) if delta else None
+        self.pending = {}      # delta mode: sidecar changes + this run's, by (sheet, row)
+        self.changes = []      # delta mode: this run's changes not yet saved
+        self.sheet_rows = {}   # delta mode: {sheet: [(admission, name), ...]} from row 1
         self.yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+        self.console = get_console()
 
     def load(self):
         try:
-            self.wb = openpyxl.load_workbook(self.file_path)
+            if self.delta:
+                self._read_rows()
+                self.pending = self.sidecar.read()
+            else:
+                self.wb = openpyxl.load_workbook(self.file_path)
             return True
         except Exception as e:
-            print(f"✗ Error loading Excel: {str(e)}")
+            self.console.error(f"✗ Error loading Excel: {str(e)}")
             return False
 
+    def _read_rows(self):
+        """Delta mode: read columns A/B of every sheet, then release the file"""
+        # A read-only workbook keeps the file open until closed (and locked on Windows)
+        wb = openpyxl.load_workbook(self.file_path, read_only=True)
+        try:
+            self.sheet_rows = {
+                ws.title: list(ws.iter_rows(min_row=1, max_col=2, values_only=True))
+                for ws in wb.worksheets
+            }
+        finally:
+            wb.close()
+
     def get_sheet_names(self):
+        if self.delta:
+            return list(self.sheet_rows)
         return self.wb.sheetnames if self.wb else []
 
     def get_students_from_sheet(self, sheet_name, start_row=3):
-        """Yields (row_idx, student_name, current_admission)"""
-        ws = self.wb[sheet_name]
-        for row_idx in range(start_row, ws.max_row + 1):
-            admission_cell = ws.cell(row=row_idx, column=1)
-            name_cell = ws.cell(row=row_idx, column=2)
-            
+        """Yields {'row_idx', 'name', 'current_admission'}"""
+        if self.delta:
+            rows = self.sheet_rows[sheet_name][start_row - 1:]
+        else:
+            rows = self.wb[sheet_name].iter_rows(min_row=start_row, max_col=2, values_only=True)
+        for row_idx, (admission, name) in enumerate(rows, start_row):
+            change = self.pending.get((sheet_name, row_idx))
+            if change is not None:
+                admission = change['admission']
+
             yield {
                 'row_idx': row_idx,
-                'name': name_cell.value,
-                'current_admission': admission_cell.value
+                'name': name,
+                'current_admission': admission
             }
 
-    def update_student(self, sheet_name, row_idx, admission_number):
+    def fingerprints(self, start_row=3):
+        """
+        sheet_fingerprints of the workbook file as this run leaves it on disk
+        (delta: the unchanged workbook, from the rows read at load)
+        """
+        if not self.delta:
+            return sheet_fingerprints(self.wb, start_row)
+        return rows_fingerprints({
+            sheet_name: rows[start_row - 1:] for sheet_name, rows in self.sheet_rows.items()
+        })
+
+    def update_student(self, sheet_name, row_idx, admission_number, score=None):
+        if self.delta:
+            self._record(sheet_name, row_idx, admission_number, score, highlight=True)
+            return
         ws = self.wb[sheet_name]
         admission_cell = ws.cell(row=row_idx, column=1)
         admission_cell.value = admission_number
         admission_cell.fill = self.yellow_fill
 
+    def clear_student(self, sheet_name, row_idx):
+        if self.delta:
+            self._record(sheet_name, row_idx, None, None, highlight=False)
+            return
+        ws = self.wb[sheet_name]
+        admission_cell = ws.cell(row=row_idx, column=1)
+        admission_cell.value = None
+        admission_cell.fill = PatternFill(fill_type=None)
+
+    def _record(self, sheet_name, row_idx, admission_number, score, highlight):
+        change = {
+            'sheet': sheet_name,
+            'row': row_idx,
+            'admission': admission_number,
+            'score': round(score, 4) if score is not None else None,
+            'highlight': highlight,
+        }
+        self.pending[(sheet_name, row_idx)] = change
+        self.changes.append(change)
+        if len(self.changes) >= self.CHECKPOINT_EVERY:
+            self.checkpoint()
+
+    def apply_changes(self, changes):
+        """Write sidecar changes into the loaded (writable) workbook; returns how many were applied"""
+        applied = 0
+        for change in changes:
+            if change['sheet'] not in self.wb.sheetnames:
+                self.console.warning(f"⚠ Sheet not found, change skipped: {change['sheet']} Row {change['row']}")
+                continue
+            if change['admission'] is None:
+                self.clear_student(change['sheet'], change['row'])
+            else:
+                self.update_student(change['sheet'], change['row'], change['admission'])
+                if not change.get('highlight', True):
+                    self.wb[change['sheet']].cell(row=change['row'], column=1).fill = PatternFill(fill_type=None)
+            applied += 1
+        return applied
+
+    def checkpoint(self):
+        """Delta mode: persist the changes made so far (cheap, append-only). No-op otherwise."""
+        if self.delta:
+            self.sidecar.append(self.changes)
+            self.changes = []
+
     def save(self):
+        if self.delta:
+            self.checkpoint()
+            return self.sidecar.path
+
         try:
             # Save to consistency _updated.xlsx
             # If input was already _updated, this overwrites it (Good for single source of truth)
@@ -45,9 +150,9 @@ class ExcelRepository:
                 output_path = self.file_path
             else:
                 output_path = self.file_path.replace('.xlsx', '_updated.xlsx')
-                
+
             self.wb.save(output_path)
             return output_path
         except Exception as e:
-            print(f"\n✗ Error saving workbook: {str(e)}")
+            self.console.error(f"\n✗ Error saving workbook: {str(e)}")
             return None
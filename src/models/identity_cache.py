@@ -0,0 +1,96 @@
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+from src.views.logger_view import get_console
+
+DEFAULT_IDENTITY_CACHE_PATH = "cache/identities.json"
+
+def normalize_name(name):
+    """Upper-case, single-spaced form of an Excel name used as the cache key"""
+    return re.sub(r'\s+', ' ', str(name).strip().upper())
+
+class IdentityCache:
+    """
+    Persistent map of Excel full name (+ class, when known) -> confirmed admission number.
+
+    Filled with high-confidence matches from every workbook, so a student already
+    resolved once (subject sheets, term sheets, club lists...) costs no portal
+    search in the next workbook. Only entries scoring >= min_score are returned.
+    With path=None the cache lives in memory only (used for replayed runs).
+    """
+
+    def __init__(self, path=DEFAULT_IDENTITY_CACHE_PATH, min_score=0.70):
+        self.path = path
+        self.min_score = min_score
+        self.entries = {}
+        self._dirty = set()
+        self.hits = 0
+        self.load()
+
+    @staticmethod
+    def key(name, target_class=None):
+        return f"{normalize_name(target_class) if target_class else ''}|{normalize_name(name)}"
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            get_console().warning(f"⚠ Could not read identity cache {self.path}: {e}")
+            self.entries = {}
+
+    def get(self, name, target_class=None):
+        """Returns {'admission', 'portal_name', 'score', ...} for a confident entry, else None"""
+        entry = self.entries.get(self.key(name, target_class))
+        if entry and entry['score'] >= self.min_score:
+            self.hits += 1
+            return entry
+        return None
+
+    def put(self, name, target_class, admission, score, portal_name, source=None):
+        if score < self.min_score:
+            return
+        key = self.key(name, target_class)
+        existing = self.entries.get(key)
+        if existing and existing['admission'] == admission and existing['score'] >= score:
+            return
+        self.entries[key] = {
+            'admission': admission,
+            'portal_name': portal_name,
+            'score': round(score, 4),
+            'source': source,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }
+        self._dirty.add(key)
+
+    def save(self):
+        """Merge our new entries into the file on disk (other runs may have written to it)"""
+        if not self.path or not self._dirty:
+            return None
+
+        on_disk = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    on_disk = json.load(f)
+            except Exception:
+                on_disk = {}
+        for key in self._dirty:
+            on_disk[key] = self.entries[key]
+        self.entries.update(on_disk)
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(on_disk, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        self._dirty.clear()
+        return self.path
+
+    def __len__(self):
+        return len(self.entries)
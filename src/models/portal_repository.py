@@ -1,55 +1,296 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from src.services.rate_controller import AdaptiveRateController
+from src.services.watchdog import deadline_paused, renew_deadline
+from src.views.logger_view import get_console
+import hashlib
 import time
 
+# Pager "next" controls seen on common table widgets (DataTables, Bootstrap, Laravel)
+NEXT_PAGE_SELECTORS = [
+    "a[rel='next']",
+    "a.paginate_button.next",
+    ".pagination li.next a",
+    ".pagination a[aria-label*='Next']",
+    "button[aria-label*='Next']",
+]
+
+# ... and their "previous" / "last page" controls (used to read a list from its end)
+PREVIOUS_PAGE_SELECTORS = [
+    "a[rel='prev']",
+    "a.paginate_button.previous",
+    ".pagination li.prev a",
+    ".pagination a[aria-label*='Previous']",
+    "button[aria-label*='Previous']",
+]
+
+LAST_PAGE_SELECTORS = [
+    "a.paginate_button.last",
+    ".pagination li.last a",
+    ".pagination a[aria-label*='Last']",
+    "button[aria-label*='Last']",
+]
+
+# "Show [10|25|100] entries" selects on the same widgets
+PAGE_SIZE_SELECTORS = [
+    "select[name$='_length']",
+    "select[name='per_page']",
+    "select[name='perPage']",
+    "select[name*='length']",
+]
+
+MAX_RESULT_PAGES = 20  # safety net for a pager that never reports its last page
+
 class PortalRepository:
-    def __init__(self, browser_manager, portal_url):
+    def __init__(self, browser_manager, portal_url, rate_controller=None):
         self.browser = browser_manager
         self.portal_url = portal_url
+        self.rate = rate_controller or AdaptiveRateController()
+        # Largest page size offered by the result table, once set for the current driver
+        self.page_size = None
+        self._sized_driver = None
+        # Pages read by the last search and whether it read them all
+        self.last_search = {'pages': 0, 'complete': True}
+        self.pages_walked = 0
+        self.console = get_console()
 
-    def search_students(self, name):
-        """Search for a student and return list of potential matches"""
+    def search_students(self, name, stop_when=None):
+        """
+        Search for a student and return list of potential matches.
+        Every result page is read (with the largest page size the table offers),
+        unless stop_when(page_rows) returns True for a page: then the walk stops
+        there and the results are marked incomplete in `last_search`.
+        """
         driver = self.browser.driver
-        results = []
-        
+        self.last_search = {'pages': 0, 'complete': True}
+
+        self._acquire()
+        started = time.monotonic()
         try:
             if "students" not in driver.current_url.lower():
                 driver.get(self.portal_url)
+                self._sized_driver = None
                 time.sleep(2)
 
             search_box = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
             )
+            if self._sized_driver is not driver:
+                self.page_size = self._maximize_page_size(driver)
+                self._sized_driver = driver
             search_box.clear()
             search_box.send_keys(name)
             time.sleep(2.5) # Increased wait for portal to refresh results
 
-            rows = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-            
-            for row in rows:
+            results, pages, complete = self._scrape_all_pages(driver, stop_when)
+
+        except TimeoutException as e:
+            self.console.warning(f" ✗ Search timed out: {str(e)}")
+            self.rate.record_failure(AdaptiveRateController.FAILURE_TIMEOUT)
+            return []
+        except Exception as e:
+            self.console.warning(f" ✗ Search error: {str(e)}")
+            self.rate.record_failure(AdaptiveRateController.FAILURE_ERROR)
+            return []
+
+        self.last_search = {'pages': pages, 'complete': complete}
+        self.pages_walked += pages
+        if pages > 1:
+            self.console.debug(
+                f"    📄 '{name}': {len(results)} rows over {pages} pages"
+                + ("" if complete else " (stopped early)")
+            )
+
+        if results:
+            # Latency per page, so long result lists don't read as a slow portal
+            self.rate.record_success((time.monotonic() - started) / pages)
+        else:
+            self.rate.record_failure(AdaptiveRateController.FAILURE_EMPTY)
+        return results
+
+    def _acquire(self):
+        """Wait for the rate limiter; the wait is not browser work, so it doesn't count against a deadline"""
+        with deadline_paused():
+            self.rate.acquire()
+
+    def iter_roster_pages(self, backwards=False):
+        """
+        Walk the unfiltered students list page by page.
+        Yields (fingerprint, scrape) per page: the fingerprint is a hash of the
+        table text (one cheap call), scrape() parses the rows only when needed.
+        backwards=True starts on the last page and walks towards the first;
+        it yields nothing if the pager has no 'last page' control.
+        """
+        driver = self.browser.driver
+        self.rate.acquire()
+        driver.get(self.portal_url)
+        time.sleep(2)
+
+        # An empty search box lists every student
+        search_box = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
+        )
+        search_box.clear()
+        time.sleep(2.5)
+
+        if backwards:
+            self.rate.acquire()
+            if not self._click_pager(driver, LAST_PAGE_SELECTORS):
+                return
+            time.sleep(2)
+        step_selectors = PREVIOUS_PAGE_SELECTORS if backwards else NEXT_PAGE_SELECTORS
+
+        while True:
+            yield self._page_fingerprint(driver), lambda: self._scrape_rows(driver)
+
+            self.rate.acquire()
+            if not self._click_pager(driver, step_selectors):
+                break
+            time.sleep(2)
+
+    def _scrape_rows(self, driver):
+        """Parse the visible result table into [{'admission': str, 'name': str}, ...]"""
+        results = []
+        rows = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
+
+        for row in rows:
+            try:
+                # Verify this is a data row
+                cells = row.find_elements(By.TAG_NAME, "td")
+                if len(cells) < 3:
+                    continue
+
+                admission_number = cells[0].text.strip()
+                first_name_portal = cells[1].text.strip().upper()
+                last_name_portal = cells[2].text.strip().upper()
+
+                portal_display = f"{first_name_portal} {last_name_portal}"
+
+                results.append({
+                    'admission': admission_number,
+                    'name': portal_display
+                })
+
+            except Exception as row_err:
+                continue
+
+        return results
+
+    def _scrape_all_pages(self, driver, stop_when=None):
+        """Returns (rows, pages read, complete) for the current search"""
+        page_rows = self._scrape_rows(driver)
+        results = list(page_rows)
+        pages = 1
+
+        while True:
+            if stop_when and stop_when(page_rows):
+                return results, pages, self._next_page_button(driver) is None
+            if pages >= MAX_RESULT_PAGES:
+                return results, pages, False
+
+            before = self._page_fingerprint(driver)
+            self._acquire()
+            # Each page gets the full search deadline
+            renew_deadline()
+            if not self._next_page(driver):
+                return results, pages, True
+            if not self._wait_for_page_change(driver, before):
+                return results, pages, True
+
+            page_rows = self._scrape_rows(driver)
+            results.extend(page_rows)
+            pages += 1
+
+    def _maximize_page_size(self, driver):
+        """Pick the largest 'rows per page' option the table offers; returns it (or None if no such control)"""
+        def option_size(option):
+            value = (option.get_attribute("value") or option.text).strip()
+            if value == "-1" or option.text.strip().upper() == "ALL":
+                return float('inf')
+            return int(value) if value.isdigit() else 0
+
+        for selector in PAGE_SIZE_SELECTORS:
+            try:
+                elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            except Exception:
+                continue
+
+            for element in elements:
                 try:
-                    # Verify this is a data row
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    if len(cells) < 3: 
+                    select = Select(element)
+                    options = select.options
+                    largest = max(options, key=option_size)
+                    if not option_size(largest):
                         continue
+                    if select.first_selected_option.get_attribute("value") != largest.get_attribute("value"):
+                        select.select_by_index(options.index(largest))
+                        time.sleep(1.5)
+                    size = largest.text.strip()
+                    self.console.info(f"✓ Result page size set to: {size}")
+                    return size
+                except Exception:
+                    continue
+
+        return None
 
-                    admission_number = cells[0].text.strip()
-                    first_name_portal = cells[1].text.strip().upper()
-                    last_name_portal = cells[2].text.strip().upper()
-                    
-                    portal_display = f"{first_name_portal} {last_name_portal}"
-                    
-                    results.append({
-                        'admission': admission_number,
-                        'name': portal_display
-                    })
-
-                except Exception as row_err:
+    def _wait_for_page_change(self, driver, before, timeout=10):
+        """Poll the table until its content differs from `before`; False if it never does"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.25)
+            if self._page_fingerprint(driver) != before:
+                return True
+        return False
+
+    def _page_fingerprint(self, driver):
+        """Short hash of the result table's text content"""
+        try:
+            text = driver.find_element(By.CSS_SELECTOR, "table tbody").text
+        except Exception:
+            text = ""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+    def _next_page(self, driver):
+        """Click the pager's 'next' control; returns False on the last page or if there is no pager"""
+        return self._click_pager(driver, NEXT_PAGE_SELECTORS)
+
+    def _click_pager(self, driver, selectors):
+        """Click the first enabled pager control matching `selectors`; False if there is none"""
+        button = self._pager_button(driver, selectors)
+        if button is None:
+            return False
+        try:
+            button.click()
+            return True
+        except Exception:
+            return False
+
+    def _next_page_button(self, driver):
+        """The pager's enabled 'next' control, or None on the last page / without a pager"""
+        return self._pager_button(driver, NEXT_PAGE_SELECTORS)
+
+    def _pager_button(self, driver, selectors):
+        """The first enabled, visible pager control matching `selectors`, or None"""
+        for selector in selectors:
+            try:
+                buttons = driver.find_elements(By.CSS_SELECTOR, selector)
+            except Exception:
+                continue
+
+            for button in buttons:
+                try:
+                    parent_class = button.find_element(By.XPATH, "./..").get_attribute("class") or ""
+                    own_class = button.get_attribute("class") or ""
+                    if (
+                        "disabled" in own_class or "disabled" in parent_class
+                        or button.get_attribute("aria-disabled") == "true"
+                        or not button.is_displayed()
+                    ):
+                        continue
+                    return button
+                except Exception:
                     continue
-            
-            return results
 
-        except Exception as e:
-            print(f" ✗ Search error: {str(e)}")
-            return []
+        return None
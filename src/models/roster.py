@@ -0,0 +1,167 @@
+import mmap
+import re
+import struct
+from array import array
+from collections import Counter
+
+
+def admission_serial(admission):
+    """Sequential part of an admission number ('CDSSJOS/STU/0589' -> 589), or None"""
+    match = re.search(r'(\d+)\s*$', admission or '')
+    return int(match.group(1)) if match else None
+
+
+class Roster:
+    """
+    Compact in-memory store for a full portal roster (100k+ students).
+
+    Instead of one dict per student, names are split into interned tokens and
+    kept as array-backed columns:
+      - tokens:             token id -> token string (each distinct token stored once)
+      - name_offsets:       student i owns name_tokens[name_offsets[i]:name_offsets[i+1]]
+      - name_tokens:        flat array of token ids
+      - admission_offsets:  student i owns admission_blob[admission_offsets[i]:admission_offsets[i+1]]
+      - admission_blob:     all admission numbers, concatenated as UTF-8 bytes
+
+    A roster can be written to disk with save() and re-opened memory-mapped
+    with Roster.open(), in which case the columns are read straight from the file.
+    """
+
+    MAGIC = b'RSTR1\n'
+    # students, tokens, name_tokens length, admission blob length, token blob length
+    HEADER = struct.Struct('<5Q')
+
+    def __init__(self):
+        self._token_ids = {}
+        self.tokens = []
+        self.name_offsets = array('I', [0])
+        self.name_tokens = array('I')
+        self.admission_offsets = array('I', [0])
+        self.admission_blob = bytearray()
+        self._mmap = None
+
+    @classmethod
+    def from_results(cls, portal_rows_data):
+        """Build a roster from portal search results ({'admission': str, 'name': str} dicts)"""
+        roster = cls()
+        for student in portal_rows_data:
+            roster.add(student['admission'], student['name'])
+        return roster
+
+    def add(self, admission, name):
+        """Append one student; returns its index"""
+        if self._mmap is not None:
+            raise ValueError("Memory-mapped roster is read-only")
+
+        for token in re.sub(r'\s+', ' ', name.upper().strip()).split():
+            token_id = self._token_ids.get(token)
+            if token_id is None:
+                token_id = len(self.tokens)
+                self._token_ids[token] = token_id
+                self.tokens.append(token)
+            self.name_tokens.append(token_id)
+        self.name_offsets.append(len(self.name_tokens))
+
+        self.admission_blob += admission.encode('utf-8')
+        self.admission_offsets.append(len(self.admission_blob))
+        return len(self) - 1
+
+    def __len__(self):
+        return len(self.name_offsets) - 1
+
+    def admission(self, idx):
+        start, end = self.admission_offsets[idx], self.admission_offsets[idx + 1]
+        return bytes(self.admission_blob[start:end]).decode('utf-8')
+
+    def name_tokens_of(self, idx):
+        tokens = self.tokens
+        start, end = self.name_offsets[idx], self.name_offsets[idx + 1]
+        return tuple(tokens[t] for t in self.name_tokens[start:end])
+
+    def name(self, idx):
+        return ' '.join(self.name_tokens_of(idx))
+
+    def iter_tokens(self, indices=None):
+        """Yields (idx, name_tokens) without building a per-student dict"""
+        for idx in (range(len(self)) if indices is None else indices):
+            yield idx, self.name_tokens_of(idx)
+
+    def iter_students(self):
+        """Yields (admission, display_name) pairs"""
+        for idx in range(len(self)):
+            yield self.admission(idx), self.name(idx)
+
+    def token_frequencies(self):
+        """Returns {token: number of students whose name contains it}"""
+        counts = Counter()
+        for idx in range(len(self)):
+            start, end = self.name_offsets[idx], self.name_offsets[idx + 1]
+            counts.update(set(self.name_tokens[start:end]))
+        return {self.tokens[t]: n for t, n in counts.items()}
+
+    def nbytes(self):
+        """Approximate bytes held by the column arrays (excluding the token table)"""
+        return (
+            len(self.name_offsets) * 4 + len(self.name_tokens) * 4 +
+            len(self.admission_offsets) * 4 + len(self.admission_blob)
+        )
+
+    # ------------------------------------------------------------------
+    # On-disk form
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Write the roster in the binary layout read back by Roster.open()"""
+        token_blob = '\n'.join(self.tokens).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(self.HEADER.pack(
+                len(self), len(self.tokens), len(self.name_tokens),
+                len(self.admission_blob), len(token_blob)
+            ))
+            for column in (self.name_offsets, self.name_tokens, self.admission_offsets):
+                f.write(column.tobytes())
+            f.write(bytes(self.admission_blob))
+            f.write(token_blob)
+        return path
+
+    @classmethod
+    def open(cls, path):
+        """Open a saved roster memory-mapped; columns are views into the file"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(mapped)
+        if bytes(view[:len(cls.MAGIC)]) != cls.MAGIC:
+            raise ValueError(f"Not a roster file: {path}")
+
+        pos = len(cls.MAGIC)
+        students, n_tokens, n_name_tokens, admission_len, token_len = cls.HEADER.unpack_from(view, pos)
+        pos += cls.HEADER.size
+
+        def take(n_bytes):
+            nonlocal pos
+            chunk = view[pos:pos + n_bytes]
+            pos += n_bytes
+            return chunk
+
+        roster = cls.__new__(cls)
+        roster._mmap = mapped
+        roster._view = view
+        roster.name_offsets = take((students + 1) * 4).cast('I')
+        roster.name_tokens = take(n_name_tokens * 4).cast('I')
+        roster.admission_offsets = take((students + 1) * 4).cast('I')
+        roster.admission_blob = take(admission_len)
+        token_blob = bytes(take(token_len)).decode('utf-8')
+        roster.tokens = token_blob.split('\n') if n_tokens else []
+        roster._token_ids = {token: i for i, token in enumerate(roster.tokens)}
+        return roster
+
+    def close(self):
+        """Release the memory map of a roster returned by Roster.open()"""
+        if self._mmap is not None:
+            for column in (self.name_offsets, self.name_tokens, self.admission_offsets,
+                           self.admission_blob, self._view):
+                column.release()
+            self._mmap.close()
+            self._mmap = None
@@ -1,54 +1,166 @@
-from src.utils.name_cleaner import get_similarity
+from difflib import SequenceMatcher
+from src.views.logger_view import get_console
+import logging
 import re
 
+# Score thresholds shared by the controller, the identity cache and rescoring
+MATCH_THRESHOLD = 0.45          # below this a match is only a forced update
+SMART_MATCH_THRESHOLD = 0.70    # confident match (also required for smart-retry hits)
+SPELLING_VARIANT_THRESHOLD = 0.8
+PERFECT_SCORE = 1.0             # no candidate can score higher
+
+def _length_bound(a, b):
+    """Upper bound of get_similarity(a, b) from the lengths alone (SequenceMatcher.real_quick_ratio)"""
+    length = len(a) + len(b)
+    return 2.0 * min(len(a), len(b)) / length if length else 1.0
+
 class StudentMatcher:
-    def __init__(self, logger=None):
+    """
+    Scores portal names against an Excel name. Scoring is a cascade, cheapest
+    first: exact words, then substrings, then spelling similarity, which only
+    runs for words whose length and letter-count bounds could still clear the
+    spelling-variant threshold, and only for candidates that could still beat
+    the best score so far. A perfect score ends the search. Scores and the
+    chosen match are the same as scoring every candidate in full.
+    """
+
+    def __init__(self, logger=None, variant_threshold=SPELLING_VARIANT_THRESHOLD):
         self.logger = logger
+        self.variant_threshold = variant_threshold
+        self.console = get_console()
+        # Similarity ratios computed, ruled out by the bounds, and candidates
+        # never scored because a perfect match came first
+        self.similarity_calls = 0
+        self.similarity_pruned = 0
+        self.candidates_skipped = 0
+
+    @staticmethod
+    def name_parts(excel_full_name):
+        """Upper-cased Excel name parts that take part in scoring (3+ characters)"""
+        full_name_clean = re.sub(r'\s+', ' ', excel_full_name.upper().strip())
+        return [p for p in full_name_clean.split() if len(p) >= 3]
+
+    def score_candidate(self, full_name_parts, portal_words, portal_full_no_space, floor=None):
+        """
+        Score one portal name (as its word set and space-less string) against the Excel name parts.
+        With `floor`, a candidate that cannot score above it is not fully scored:
+        some score <= floor is returned instead.
+        """
+        if not full_name_parts:
+            return 0
+
+        # Method 1: Exact word matching
+        matching_words = set(full_name_parts).intersection(portal_words)
+        exact_score = len(matching_words) / len(full_name_parts)
+        if exact_score >= PERFECT_SCORE:
+            return exact_score
+
+        # Method 2: Improved Fuzzy Matching
+        # Substrings first: each is a full point; other parts can only add a
+        # spelling variant's similarity, from words whose bounds clear the threshold
+        substrings = [part in portal_full_no_space for part in full_name_parts]
+        variant_words = [
+            None if is_substring else [w for w in portal_words if _length_bound(part, w) > self.variant_threshold]
+            for part, is_substring in zip(full_name_parts, substrings)
+        ]
+        if floor is not None and max(exact_score, self._fuzzy_bound(0, variant_words, len(full_name_parts))) <= floor:
+            self.similarity_pruned += sum(len(portal_words) for words in variant_words if words is not None)
+            return exact_score
+
+        fuzzy_points = 0
+        for i, (part, words) in enumerate(zip(full_name_parts, variant_words)):
+            if words is None:
+                fuzzy_points += 1
+                continue
+            self.similarity_pruned += len(portal_words) - len(words)
+            max_sim = self._best_variant_similarity(part, words)
+            if max_sim > self.variant_threshold: # Threshold for spelling variants
+                fuzzy_points += max_sim
+            if floor is not None and max(exact_score, self._fuzzy_bound(fuzzy_points, variant_words[i + 1:], len(full_name_parts))) <= floor:
+                self.similarity_pruned += sum(len(portal_words) for words in variant_words[i + 1:] if words is not None)
+                return exact_score
+
+        fuzzy_score = fuzzy_points / len(full_name_parts)
+        return max(exact_score, fuzzy_score)
+
+    def _best_variant_similarity(self, part, words):
+        """Highest get_similarity(part, w), skipping words whose quick_ratio bound cannot clear the threshold"""
+        max_sim = 0
+        for word in words:
+            matcher = SequenceMatcher(None, part, word)
+            if matcher.quick_ratio() <= self.variant_threshold:
+                self.similarity_pruned += 1
+                continue
+            self.similarity_calls += 1
+            max_sim = max(max_sim, matcher.ratio())
+        return max_sim
+
+    def _fuzzy_bound(self, fuzzy_points, remaining, count):
+        """Highest fuzzy score still possible: one more point for every remaining part that can add one"""
+        # Added one by one, in part order, like the points themselves (same float rounding)
+        bound = fuzzy_points
+        for words in remaining:
+            if words is None or words:
+                bound += 1
+        return bound / count
 
     def find_best_match(self, excel_full_name, portal_rows_data):
         """
         Find best match for excel_full_name among portal_rows_data.
         portal_rows_data: list of dicts with {'admission': str, 'name': str}
         """
-        full_name_clean = re.sub(r'\s+', ' ', excel_full_name.upper().strip())
-        full_name_parts = [p for p in full_name_clean.split() if len(p) >= 3]
+        full_name_parts = self.name_parts(excel_full_name)
 
         best_match = None
         best_score = 0
-        
+        show_candidates = self.console.isEnabledFor(logging.DEBUG)
+
         # Log matching attempts if needed, or return all scores to controller?
         # Keeping it simple: return the best match tuple (admission, display_name, score)
 
-        for portal_student in portal_rows_data:
+        for position, portal_student in enumerate(portal_rows_data):
+            if best_score >= PERFECT_SCORE and not show_candidates:
+                self.candidates_skipped += len(portal_rows_data) - position
+                break
+
             portal_display = portal_student['name']
             admission_number = portal_student['admission']
-            
+
             portal_full_no_space = portal_display.replace(" ", "")
             portal_words = set(portal_display.split())
 
-            # Method 1: Exact word matching
-            matching_words = set(full_name_parts).intersection(portal_words)
-            exact_score = len(matching_words) / len(full_name_parts) if full_name_parts else 0
-
-            # Method 2: Improved Fuzzy Matching
-            fuzzy_points = 0
-            for part in full_name_parts:
-                if part in portal_full_no_space:
-                    fuzzy_points += 1
-                else:
-                    # Check similarity against each word in the portal name
-                    word_sims = [get_similarity(part, w) for w in portal_words]
-                    max_sim = max(word_sims) if word_sims else 0
-                    if max_sim > 0.8: # Threshold for spelling variants
-                        fuzzy_points += max_sim
-            
-            fuzzy_score = fuzzy_points / len(full_name_parts) if full_name_parts else 0
-            normalized_score = max(exact_score, fuzzy_score)
-
-            print(f" • {portal_display}: {admission_number} (Score: {normalized_score:.0%})")
+            # Listing every candidate's score needs them fully scored
+            floor = None if show_candidates else best_score
+            normalized_score = self.score_candidate(full_name_parts, portal_words, portal_full_no_space, floor)
+
+            if show_candidates:
+                self.console.debug(f" • {portal_display}: {admission_number} (Score: {normalized_score:.0%})")
 
             if normalized_score > best_score:
                 best_score = normalized_score
                 best_match = (admission_number, portal_display)
 
         return best_match, best_score
+
+    def find_best_match_in_roster(self, excel_full_name, roster, indices=None):
+        """
+        Same scoring as find_best_match, but reads candidates straight from a
+        Roster (optionally only the given student indices) instead of dicts.
+        """
+        full_name_parts = self.name_parts(excel_full_name)
+
+        best_idx = None
+        best_score = 0
+
+        for position, (idx, tokens) in enumerate(roster.iter_tokens(indices)):
+            if best_score >= PERFECT_SCORE:
+                self.candidates_skipped += (len(roster) if indices is None else len(indices)) - position
+                break
+            normalized_score = self.score_candidate(full_name_parts, set(tokens), ''.join(tokens), best_score)
+            if normalized_score > best_score:
+                best_score = normalized_score
+                best_idx = idx
+
+        if best_idx is None:
+            return None, best_score
+        return (roster.admission(best_idx), roster.name(best_idx)), best_score
@@ -0,0 +1,64 @@
+import os
+from collections import Counter
+
+from src.models.roster import Roster
+
+class TokenStats:
+    """
+    How many students carry each name token, i.e. roughly how many rows a portal
+    search for that token returns. Seeded from the local roster when there is one
+    (complete counts), otherwise grown from the portal results seen so far.
+    """
+
+    def __init__(self, counts=None, students=0, complete=False):
+        self.counts = Counter(counts or {})
+        self.students = students
+        self.complete = complete
+        self._seen = set()
+
+    @classmethod
+    def from_roster(cls, roster):
+        return cls(roster.token_frequencies(), students=len(roster), complete=True)
+
+    @classmethod
+    def for_roster_file(cls, roster_path):
+        """Counts from the local roster file if it exists, else empty stats that learn as they go"""
+        if not roster_path or not os.path.exists(roster_path):
+            return cls()
+        roster = Roster.open(roster_path)
+        try:
+            return cls.from_roster(roster)
+        finally:
+            roster.close()
+
+    def __len__(self):
+        return len(self.counts)
+
+    def observe(self, rows):
+        """Count the name tokens of portal rows not seen before (by admission number)"""
+        if self.complete:
+            return
+        for row in rows:
+            if row['admission'] in self._seen:
+                continue
+            self._seen.add(row['admission'])
+            self.students += 1
+            self.counts.update(set(row['name'].split()))
+
+    def estimate(self, term):
+        """
+        Expected result rows for a search by `term` (one or more tokens, assumed
+        independent). None when nothing is known about one of its tokens yet.
+        """
+        estimate = None
+        for token in term.split():
+            count = self.counts.get(token)
+            if count is None:
+                if not self.complete:
+                    return None
+                count = 0
+            if estimate is None:
+                estimate = count
+            else:
+                estimate = estimate * count / self.students if self.students else 0
+        return estimate
@@ -0,0 +1,55 @@
+import json
+import os
+from pathlib import Path
+
+def sidecar_path_for(excel_path):
+    """'JSS1.xlsx' and 'JSS1_updated.xlsx' -> 'JSS1_updates.jsonl' next to them"""
+    path = Path(excel_path)
+    stem = path.stem[:-len('_updated')] if path.stem.endswith('_updated') else path.stem
+    return str(path.with_name(f"{stem}_updates.jsonl"))
+
+class UpdateSidecar:
+    """
+    Append-only file of cell changes waiting to be written into a workbook, one
+    JSON line per change: {'sheet', 'row', 'admission', 'score', 'highlight'}
+    (admission None = cleared). Saving a run costs one line per update instead
+    of rewriting the workbook; `apply-updates` patches them in later.
+    Later lines for the same cell win.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def append(self, changes):
+        if not changes:
+            return 0
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for change in changes:
+                f.write(json.dumps(change, ensure_ascii=False, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return len(changes)
+
+    def read(self):
+        """{(sheet, row): change}, latest change per cell"""
+        changes = {}
+        if not self.exists():
+            return changes
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    change = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash
+                changes[(change['sheet'], change['row'])] = change
+        return changes
+
+    def remove(self):
+        if self.exists():
+            os.remove(self.path)
@@ -0,0 +1,161 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from src.models.batch_manifest import sheet_fingerprints
+from src.utils.name_cleaner import clean_name
+
+DEFAULT_SHARD_DIR = "shards"
+
+def pending_rows(excel_repo, start_row=3):
+    """[{'sheet', 'row', 'name'}] for every named row without an admission number"""
+    rows = []
+    for sheet_name in excel_repo.get_sheet_names():
+        for student in excel_repo.get_students_from_sheet(sheet_name, start_row):
+            name = student['name']
+            admission = student['current_admission']
+            if not name or name == "NAME":
+                continue
+            if admission and isinstance(admission, str) and "CDSSJOS" in admission:
+                continue
+            rows.append({'sheet': sheet_name, 'row': student['row_idx'], 'name': str(name)})
+    return rows
+
+def split_rows(rows, count):
+    """
+    Deal rows into `count` shards of similar size. Rows sharing a search term
+    (first name part) go to the same shard, so each shard's search cache and
+    identity cache still catch the repeats.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault((clean_name(row['name']) or "").upper(), []).append(row)
+
+    shards = [[] for _ in range(count)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(shards, key=len).extend(group)
+    for shard in shards:
+        shard.sort(key=lambda r: (r['sheet'], r['row']))
+    return shards
+
+
+class WorkShard:
+    """
+    A self-contained slice of one workbook's pending rows, processed by `run-shard`
+    on any machine: the rows (sheet, row, name), the class filter, and the
+    workbook's sheet fingerprints at split time (checked again by `merge`).
+    """
+
+    def __init__(self, workbook, index, count, rows, target_class=None, fingerprints=None, created=None):
+        self.workbook = workbook
+        self.index = index
+        self.count = count
+        self.rows = rows
+        self.target_class = target_class
+        self.fingerprints = fingerprints or {}
+        self.created = created or datetime.now().isoformat(timespec='seconds')
+
+    @property
+    def name(self):
+        return f"{Path(self.workbook).stem}.shard-{self.index:02d}-of-{self.count:02d}"
+
+    @classmethod
+    def split_workbook(cls, excel_repo, count, target_class=None):
+        """WorkShards for a loaded ExcelRepository (empty shards are dropped)"""
+        fingerprints = sheet_fingerprints(excel_repo.wb)
+        shards = split_rows(pending_rows(excel_repo), count)
+        return [
+            cls(excel_repo.file_path, index, count, rows, target_class, fingerprints)
+            for index, rows in enumerate(shards, 1) if rows
+        ]
+
+    def save(self, directory=DEFAULT_SHARD_DIR):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        path = os.path.join(directory, f"{self.name}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'workbook': os.path.basename(self.workbook),
+                'class': self.target_class,
+                'shard': self.index,
+                'shards': self.count,
+                'created': self.created,
+                'fingerprints': self.fingerprints,
+                'rows': self.rows,
+            }, f, ensure_ascii=False, indent=1)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(
+            data['workbook'], data['shard'], data['shards'], data['rows'],
+            data.get('class'), data.get('fingerprints'), data.get('created')
+        )
+
+
+class ShardResults:
+    """
+    Results file of one processed shard: JSON lines, a header
+    ({'workbook', 'class', 'shard', 'shards', 'fingerprints'}) then one line per row:
+      {'sheet', 'row', 'name', 'admission', 'portal_name', 'score', 'source'}
+    Written row by row, so an interrupted shard keeps what it finished and a
+    rerun continues after the rows already in the file (`done`).
+    """
+
+    def __init__(self, path, shard):
+        self.path = path
+        self.shard = shard
+        self._file = None
+        self.rows = 0
+        self.done = set()
+        if os.path.exists(path):
+            _, rows = self.read(path)
+            self.done = {(r['sheet'], r['row']) for r in rows}
+
+    @classmethod
+    def for_shard(cls, shard, directory=DEFAULT_SHARD_DIR):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        return cls(os.path.join(directory, f"{shard.name}.results.jsonl"), shard)
+
+    def add(self, row, best_match, score, source):
+        if self._file is None and self.done:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        elif self._file is None:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write({
+                'workbook': os.path.basename(self.shard.workbook),
+                'class': self.shard.target_class,
+                'shard': self.shard.index,
+                'shards': self.shard.count,
+                'fingerprints': self.shard.fingerprints,
+            })
+        self._write({
+            'sheet': row['sheet'],
+            'row': row['row'],
+            'name': row['name'],
+            'admission': best_match[0] if best_match else None,
+            'portal_name': best_match[1] if best_match else None,
+            'score': round(score, 4),
+            'source': source,
+        })
+        self.done.add((row['sheet'], row['row']))
+        self.rows += 1
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def read(path):
+        """Returns (header, rows)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            rows = [json.loads(line) for line in f if line.strip()]
+        return header, rows
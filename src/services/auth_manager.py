@@ -2,24 +2,39 @@ import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from src.views.logger_view import get_console
 
 class AuthManager:
     def __init__(self, browser_manager, portal_url):
         self.browser = browser_manager
         self.portal_url = portal_url
+        self.console = get_console()
+
+    def is_logged_in(self):
+        """True if the portal opens without asking for credentials (reused browser or saved profile)"""
+        driver = self.browser.driver
+        try:
+            driver.get(self.portal_url)
+            time.sleep(2)
+            if driver.find_elements(By.NAME, "password"):
+                return False
+            current_url = driver.current_url.lower()
+            return "students" in current_url or "dashboard" in current_url
+        except Exception:
+            return False
 
     def login(self, username, password):
         """Login to the portal"""
         driver = self.browser.driver
         try:
-            print(f"\n→ Navigating to {self.portal_url}")
+            self.console.info(f"\n→ Navigating to {self.portal_url}")
             driver.get(self.portal_url)
             
             # Wait for login page to load
-            print("→ Waiting for login page...")
+            self.console.info("→ Waiting for login page...")
             time.sleep(3)
             
-            print("→ Attempting to log in...")
+            self.console.info("→ Attempting to log in...")
             
             # Try to find username/email field
             try:
@@ -42,17 +57,17 @@ class AuthManager:
             login_button.click()
             
             # Wait for navigation after login
-            print("→ Logging in...")
+            self.console.info("→ Logging in...")
             time.sleep(5)
             
             # Check if login was successful
             if "students" in driver.current_url.lower() or "dashboard" in driver.current_url.lower():
-                print("✓ Login successful!")
+                self.console.info("✓ Login successful!")
                 return True
             else:
-                print("✗ Login may have failed. Please check credentials.")
+                self.console.error("✗ Login may have failed. Please check credentials.")
                 return False
                 
         except Exception as e:
-            print(f"✗ Login error: {str(e)}")
+            self.console.error(f"✗ Login error: {str(e)}")
             return False
@@ -1,25 +1,82 @@
+import os
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from src.views.logger_view import get_console
 
 class BrowserManager:
-    def __init__(self):
+    def __init__(self, user_data_dir=None, page_load_timeout=45):
         self.driver = None
+        self.page_load_timeout = page_load_timeout
+        # Searches served by the current driver (the watchdog recycles it after N)
+        self.searches = 0
+        # Optional persistent Chrome profile: keeps the portal's JS/CSS cache
+        # (and session cookies) warm between runs
+        self.user_data_dir = user_data_dir
+        self.console = get_console()
 
     def setup(self):
         """Initialize Chrome WebDriver with appropriate options"""
         chrome_options = Options()
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
+        if self.user_data_dir:
+            chrome_options.add_argument(f'--user-data-dir={os.path.abspath(self.user_data_dir)}')
         # Remove headless mode so you can see what's happening
         # chrome_options.add_argument('--headless')
         
         self.driver = webdriver.Chrome(options=chrome_options)
         self.driver.maximize_window()
-        print("✓ Browser initialized")
+        # A page that never finishes loading raises instead of blocking driver.get forever
+        self.driver.set_page_load_timeout(self.page_load_timeout)
+        self.searches = 0
+        self.console.info("✓ Browser initialized")
         return self.driver
 
+    def ensure_started(self):
+        """Start the browser unless it is already running; returns True if it was started now"""
+        if self.is_alive():
+            return False
+        self.setup()
+        return True
+
+    def is_alive(self):
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def reset(self, portal_url):
+        """Bring a reused browser back to the students page between files"""
+        if not self.is_alive():
+            return False
+        try:
+            self.driver.get(portal_url)
+            return True
+        except Exception as e:
+            self.console.warning(f"⚠ Could not reset browser: {e}")
+            return False
+
     def close(self):
         """Close browser and cleanup"""
         if self.driver:
             self.driver.quit()
-            print("\n✓ Browser closed")
+            self.driver = None
+            self.console.info("\n✓ Browser closed")
+
+    def kill(self, grace=10):
+        """Tear down a possibly hung driver: quit if it answers within `grace` seconds, else kill chromedriver"""
+        driver, self.driver = self.driver, None
+        if not driver:
+            return
+        quitter = threading.Thread(target=driver.quit, daemon=True)
+        quitter.start()
+        quitter.join(grace)
+        if quitter.is_alive():
+            process = getattr(getattr(driver, 'service', None), 'process', None)
+            if process:
+                process.kill()
+        self.console.info("✓ Browser killed")
@@ -3,11 +3,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
+from src.views.logger_view import get_console
 
 class ClassFilterManager:
     def __init__(self, browser_manager):
         self.browser = browser_manager
         self.target_class = None
+        self.console = get_console()
 
     def set_class_filter(self, target_class):
         """Set the class filter once after login"""
@@ -18,7 +20,7 @@ class ClassFilterManager:
             return False
         
         try:
-            print(f"\n→ Setting class filter to: {self.target_class}")
+            self.console.info(f"\n→ Setting class filter to: {self.target_class}")
             
             time.sleep(2)
             
@@ -59,19 +61,19 @@ class ClassFilterManager:
                     pass
             
             if not class_dropdown:
-                print(f"✗ Could not find CLASS dropdown on page\n")
+                self.console.error(f"✗ Could not find CLASS dropdown on page\n")
                 return False
             
             try:
                 select = Select(class_dropdown)
                 available_options = [opt.text.strip() for opt in select.options if opt.text.strip()]
-                print(f"  Available classes: {available_options}")
+                self.console.info(f"  Available classes: {available_options}")
                 
                 # Try exact match
                 for option in select.options:
                     if option.text.strip() == self.target_class:
                         select.select_by_visible_text(option.text.strip())
-                        print(f"✓ Class filter set to: {option.text.strip()}\n")
+                        self.console.info(f"✓ Class filter set to: {option.text.strip()}\n")
                         time.sleep(2)
                         return True
                 
@@ -79,17 +81,17 @@ class ClassFilterManager:
                 for option in select.options:
                     if self.target_class.upper() in option.text.strip().upper():
                         select.select_by_visible_text(option.text.strip())
-                        print(f"✓ Class filter set to: {option.text.strip()}\n")
+                        self.console.info(f"✓ Class filter set to: {option.text.strip()}\n")
                         time.sleep(2)
                         return True
                 
-                print(f"✗ Could not find class matching '{self.target_class}' in: {available_options}\n")
+                self.console.error(f"✗ Could not find class matching '{self.target_class}' in: {available_options}\n")
                 return False
                 
             except Exception as e:
-                print(f"✗ Error using Select: {e}")
+                self.console.error(f"✗ Error using Select: {e}")
                 return False
                 
         except Exception as e:
-            print(f"⚠ Could not set class filter: {e}\n")
+            self.console.warning(f"⚠ Could not set class filter: {e}\n")
             return False
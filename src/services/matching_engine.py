@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+import tempfile
+from array import array
+
+from src.models.roster import Roster
+from src.models.student_matcher import StudentMatcher
+from src.views.logger_view import get_console, configure_worker_console
+
+# Per-process state. With the 'fork' start method the parent fills these in
+# before the pool starts and workers inherit them copy-on-write; otherwise each
+# worker memory-maps the roster file once in _init_worker. The parent clears
+# them again when a match() is done, so they never outlive the roster.
+_roster = None
+_index = None
+_matcher = None
+
+
+def build_token_index(roster):
+    """{token: array of student indices whose name contains it}"""
+    index = {}
+    for idx, tokens in roster.iter_tokens():
+        for token in set(tokens):
+            column = index.get(token)
+            if column is None:
+                column = index[token] = array('I')
+            column.append(idx)
+    return index
+
+
+def _init_worker(console_level, roster_path=None):
+    global _roster, _index, _matcher
+    configure_worker_console(console_level)
+    if roster_path:
+        _roster = Roster.open(roster_path)
+        _index = build_token_index(_roster)
+    _matcher = StudentMatcher()
+
+
+def _match_one(name):
+    """Score `name` against every roster student sharing at least one name part with it"""
+    candidates = set()
+    for part in StudentMatcher.name_parts(name):
+        column = _index.get(part)
+        if column is not None:
+            candidates.update(column)
+    if not candidates:
+        return None, 0
+    return _matcher.find_best_match_in_roster(name, _roster, sorted(candidates))
+
+
+def _match_chunk(chunk):
+    return [(key, *_match_one(name)) for key, name in chunk]
+
+
+class MatchingEngine:
+    """
+    Matches many Excel rows against a full local Roster, sharding the rows over a
+    process pool. Results stream back in input order as (key, best_match, score).
+
+    The roster is shipped to the workers once: inherited through fork where the
+    platform supports it, otherwise memory-mapped from its file by each worker.
+    Candidates per row are the roster students sharing at least one name part
+    (what a portal search by that part would return), scored with StudentMatcher.
+    """
+
+    def __init__(self, roster, workers=None, chunk_size=64, roster_path=None):
+        self.roster = roster
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.roster_path = roster_path
+
+    def match(self, rows):
+        """rows: iterable of (key, excel_name). Yields (key, best_match, score) in the same order."""
+        global _roster, _index, _matcher
+        rows = list(rows)
+        chunks = [rows[i:i + self.chunk_size] for i in range(0, len(rows), self.chunk_size)]
+
+        tmp_path = None
+        try:
+            if self.workers <= 1:
+                _roster, _index, _matcher = self.roster, build_token_index(self.roster), StudentMatcher()
+                for chunk in chunks:
+                    yield from _match_chunk(chunk)
+                return
+
+            console_level = get_console().level
+            if 'fork' in multiprocessing.get_all_start_methods():
+                _roster, _index = self.roster, build_token_index(self.roster)
+                context = multiprocessing.get_context('fork')
+                initargs = (console_level,)
+            else:
+                context = multiprocessing.get_context()
+                roster_path = self.roster_path
+                if not roster_path:
+                    fd, tmp_path = tempfile.mkstemp(suffix=".roster")
+                    os.close(fd)
+                    roster_path = self.roster.save(tmp_path)
+                initargs = (console_level, roster_path)
+
+            with context.Pool(self.workers, initializer=_init_worker, initargs=initargs) as pool:
+                for results in pool.imap(_match_chunk, chunks):
+                    yield from results
+        finally:
+            _roster = _index = _matcher = None
+            if tmp_path:
+                os.remove(tmp_path)
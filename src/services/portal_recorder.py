@@ -0,0 +1,230 @@
+import copy
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.views.logger_view import get_console
+
+REPLAY_LATENCY_RECORDED = "recorded"
+
+
+class PortalRecording:
+    """
+    Fixture of everything the portal answered during a run:
+      - login outcomes (in order) and how long each took
+      - class filter outcomes per class
+      - search results (and how long each took) per class and search term
+    """
+
+    def __init__(self, path, data=None):
+        self.path = path
+        self.data = data or {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'login': [],
+            'class_filter': {},
+            'searches': {},
+        }
+        # Class filter currently applied; searches are recorded/replayed under it
+        self.current_class = None
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(path, json.load(f))
+
+    def save(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def _class_searches(self):
+        return self.data['searches'].setdefault(self.current_class or "", {})
+
+    def add_search(self, term, results, latency, pages=1, complete=True):
+        """Latest answer per term, except that a walk stopped early never replaces a complete one"""
+        searches = self._class_searches()
+        previous = searches.get(term)
+        if previous is not None and previous.get('complete', True) and not complete:
+            return
+        searches[term] = {
+            'rows': results, 'latency': round(latency, 3), 'pages': pages, 'complete': complete
+        }
+
+    def get_search(self, term):
+        return self.data['searches'].get(self.current_class or "", {}).get(term)
+
+
+# ----------------------------------------------------------------------
+# Recording: wrap the live components and capture what they return
+# ----------------------------------------------------------------------
+
+class RecordingAuthManager:
+    def __init__(self, auth_manager, recording):
+        self.auth_manager = auth_manager
+        self.recording = recording
+
+    def __getattr__(self, name):
+        return getattr(self.auth_manager, name)
+
+    def login(self, username, password):
+        started = time.monotonic()
+        success = self.auth_manager.login(username, password)
+        self.recording.data['login'].append(success)
+        self.recording.data.setdefault('login_latency', []).append(round(time.monotonic() - started, 3))
+        return success
+
+
+class RecordingClassFilterManager:
+    def __init__(self, class_filter_manager, recording):
+        self.class_filter_manager = class_filter_manager
+        self.recording = recording
+
+    def __getattr__(self, name):
+        return getattr(self.class_filter_manager, name)
+
+    def set_class_filter(self, target_class):
+        success = self.class_filter_manager.set_class_filter(target_class)
+        self.recording.current_class = target_class if success else None
+        if target_class:
+            self.recording.data['class_filter'][target_class] = success
+        return success
+
+
+class RecordingPortalRepository:
+    def __init__(self, portal_repo, recording):
+        self.portal_repo = portal_repo
+        self.recording = recording
+
+    def __getattr__(self, name):
+        return getattr(self.portal_repo, name)
+
+    def search_students(self, name, stop_when=None):
+        started = time.monotonic()
+        results = self.portal_repo.search_students(name, stop_when)
+        last = self.portal_repo.last_search
+        self.recording.add_search(name, results, time.monotonic() - started, last['pages'], last['complete'])
+        return results
+
+
+# ----------------------------------------------------------------------
+# Replay: stand-ins for the browser-backed components
+# ----------------------------------------------------------------------
+
+class ReplayBrowserManager:
+    """No browser at all; keeps the BrowserManager interface used by the controllers"""
+
+    def __init__(self):
+        self.driver = None
+        self.searches = 0
+
+    def setup(self):
+        self.searches = 0
+        return None
+
+    def ensure_started(self):
+        return False
+
+    def is_alive(self):
+        return True
+
+    def reset(self, portal_url):
+        return True
+
+    def close(self):
+        pass
+
+    def kill(self, grace=10):
+        self.searches = 0
+
+
+class ReplayAuthManager:
+    def __init__(self, recording, latency=0.0):
+        self.recording = recording
+        self.latency = latency
+        self._logins = 0
+
+    def is_logged_in(self):
+        return False
+
+    def login(self, username, password):
+        outcomes = self.recording.data['login']
+        success = outcomes[min(self._logins, len(outcomes) - 1)] if outcomes else True
+        # Login time is only replayed with recorded latency (fixtures before it have none)
+        latencies = self.recording.data.get('login_latency')
+        if self.latency == REPLAY_LATENCY_RECORDED and latencies:
+            time.sleep(latencies[min(self._logins, len(latencies) - 1)])
+        self._logins += 1
+        return success
+
+
+class ReplayClassFilterManager:
+    def __init__(self, recording):
+        self.recording = recording
+        self.target_class = None
+
+    def set_class_filter(self, target_class):
+        self.target_class = target_class
+        if not target_class:
+            return False
+        success = self.recording.data['class_filter'].get(target_class, False)
+        self.recording.current_class = target_class if success else None
+        return success
+
+
+class ReplayPortalRepository:
+    """
+    Serves recorded search results deterministically.
+    latency: seconds to simulate per search, or REPLAY_LATENCY_RECORDED to
+    replay the latency measured while recording.
+    """
+
+    def __init__(self, recording, latency=0.0):
+        self.recording = recording
+        self.latency = latency
+        self.searches = 0
+        self.misses = 0
+        self.last_search = {'pages': 0, 'complete': True}
+        self.pages_walked = 0
+        self.console = get_console()
+
+    def search_students(self, name, stop_when=None):
+        """Recorded rows as they were read then (stop_when is not re-applied)"""
+        self.searches += 1
+        entry = self.recording.get_search(name)
+        self.last_search = {'pages': 0, 'complete': True}
+
+        if entry is None:
+            self.misses += 1
+            self.console.debug(f"    ∅ No recording for search: {name}")
+            return []
+
+        # Fixtures recorded before page walking have neither field
+        self.last_search = {'pages': entry.get('pages', 1), 'complete': entry.get('complete', True)}
+        self.pages_walked += self.last_search['pages']
+
+        delay = entry['latency'] if self.latency == REPLAY_LATENCY_RECORDED else self.latency
+        if delay:
+            time.sleep(delay)
+        return copy.deepcopy(entry['rows'])
+
+
+class ReplayBackend:
+    """Builds the replay stand-ins for a ScraperController from one fixture file"""
+
+    def __init__(self, fixture_path, latency=0.0):
+        self.recording = PortalRecording.load(fixture_path)
+        self.latency = latency
+
+    def build(self):
+        """Returns (browser_manager, auth_manager, class_filter_manager, portal_repo)"""
+        return (
+            ReplayBrowserManager(),
+            ReplayAuthManager(self.recording, self.latency),
+            ReplayClassFilterManager(self.recording),
+            ReplayPortalRepository(self.recording, self.latency),
+        )
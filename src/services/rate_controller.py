@@ -0,0 +1,88 @@
+import time
+from src.views.logger_view import get_console
+
+class AdaptiveRateController:
+    """
+    Token bucket in front of every portal request, with an AIMD rate:
+      - additive increase while requests succeed quickly
+      - multiplicative decrease on errors, timeouts and empty result tables
+      - exponential cool-down pause on consecutive errors/timeouts
+    The rate never exceeds `max_rate` (requests/minute) so we stay polite to the school server.
+    """
+
+    FAILURE_ERROR = "error"
+    FAILURE_TIMEOUT = "timeout"
+    FAILURE_EMPTY = "empty"
+
+    def __init__(self, max_rate=20, min_rate=3, start_rate=12, target_latency=4.0,
+                 increase=1.0, decrease=0.5, burst=2, base_cooldown=2.0, max_cooldown=60.0):
+        if max_rate <= 0:
+            raise ValueError(f"max_rate must be above 0 requests/minute, got {max_rate}")
+        self.max_rate = max_rate
+        # A max_rate below the default floor lowers the floor: backing off never speeds up
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = min(start_rate, max_rate)
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+
+        self.tokens = burst
+        self._last_refill = time.monotonic()
+        self._cooldown_until = 0
+        self._consecutive_failures = 0
+
+        self.requests = 0
+        self.backoff_events = 0
+        self.rows_done = 0
+        self.started = time.monotonic()
+        self.console = get_console()
+
+    def acquire(self):
+        """Block until the bucket (and any cool-down) allows the next request"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate / 60)
+            self._last_refill = now
+
+            wait = self._cooldown_until - now
+            if wait <= 0 and self.tokens >= 1:
+                self.tokens -= 1
+                self.requests += 1
+                return
+            if wait <= 0:
+                wait = (1 - self.tokens) * 60 / self.rate
+            time.sleep(wait)
+
+    def record_success(self, latency):
+        self._consecutive_failures = 0
+        if latency <= self.target_latency:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_failure(self, reason):
+        self._consecutive_failures += 1
+        self.backoff_events += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+
+        message = f"    ⏸ Backing off ({reason}) - rate now {self.rate:.1f}/min"
+        if reason != self.FAILURE_EMPTY:
+            # An empty table can just mean "no such student"; only hard failures pause
+            cooldown = min(self.max_cooldown, self.base_cooldown * 2 ** (self._consecutive_failures - 1))
+            self._cooldown_until = time.monotonic() + cooldown
+            message += f", pausing {cooldown:.1f}s"
+        self.console.info(message)
+
+    def row_done(self):
+        self.rows_done += 1
+
+    def rows_per_minute(self):
+        elapsed = time.monotonic() - self.started
+        return self.rows_done * 60 / elapsed if elapsed > 0 else 0
+
+    def status(self):
+        return (
+            f"rate {self.rate:.1f}/min | backoffs {self.backoff_events} | "
+            f"{self.rows_per_minute():.1f} rows/min"
+        )
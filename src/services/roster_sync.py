@@ -0,0 +1,215 @@
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.models.roster import Roster, admission_serial
+
+ORDER_ASCENDING = "asc"
+ORDER_DESCENDING = "desc"
+
+
+class RosterSync:
+    """
+    Keeps a locally stored Roster in step with the portal without a full crawl.
+
+    Alongside the roster file, a small JSON state file remembers the last sync:
+    each page's content fingerprint and admission numbers, the highest admission
+    serial seen, and the portal's sort order. On the next sync:
+      - pages whose fingerprint is unchanged are not parsed at all
+      - newest-first portals: the walk stops at the first page with nothing newer
+        than the high-water mark (or an unchanged page)
+      - oldest-first portals: the list is read from its last page backwards, with
+        the same stop rule (falls back to a forward walk if the pager can't jump)
+      - removed students are only detected when the whole list was walked
+    """
+
+    def __init__(self, portal_repo, roster_path):
+        self.portal_repo = portal_repo
+        self.roster_path = str(roster_path)
+        self.state_path = self.roster_path + ".sync.json"
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {'pages': [], 'high_water': None, 'order': None}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_students(self):
+        """Current local roster as {admission: name}, in roster order"""
+        if not os.path.exists(self.roster_path):
+            return {}
+        roster = Roster.open(self.roster_path)
+        try:
+            return dict(roster.iter_students())
+        finally:
+            roster.close()
+
+    def sync(self, full=False):
+        """
+        Fetch what changed since the last sync and merge it into the local roster.
+        full=True re-parses every page (detects changes/removals anywhere).
+        Returns a summary dict.
+        """
+        started = time.time()
+        state = self.load_state()
+        old_pages = state['pages']
+        high_water = state['high_water']
+        order = state['order']
+
+        students = self.load_students()
+        can_jump = state.get('tail_walk', True)
+        if order == ORDER_ASCENDING and not full and high_water is not None and students and can_jump:
+            summary = self._sync_tail(state, students, started)
+            if summary is not None:
+                return summary
+            can_jump = False
+
+        added, changed = [], []
+        seen = set()
+        new_pages = []
+        pages_walked = 0
+        pages_parsed = 0
+        stopped_early = False
+
+        for page_no, (fingerprint, scrape) in enumerate(self.portal_repo.iter_roster_pages()):
+            pages_walked += 1
+            old_page = old_pages[page_no] if page_no < len(old_pages) else None
+
+            if old_page and old_page[0] == fingerprint and not full and students:
+                # Unchanged page: keep what we know without parsing it
+                seen.update(old_page[1])
+                new_pages.append(old_page)
+                if order == ORDER_DESCENDING:
+                    stopped_early = True
+                    break
+                continue
+
+            admissions = self._merge_rows(scrape(), students, seen, added, changed)
+            pages_parsed += 1
+            new_pages.append([fingerprint, admissions])
+
+            if page_no == 0:
+                order = self._detect_order(admissions) or order
+
+            # Newest-first: once a whole page is at or below the previous
+            # high-water mark, every later page is older still.
+            if order == ORDER_DESCENDING and not full and self._all_older(admissions, high_water):
+                stopped_early = True
+                break
+
+        if stopped_early:
+            # Pages we did not walk keep their previous fingerprints
+            new_pages.extend(old_pages[len(new_pages):])
+            removed = []
+        else:
+            removed = [a for a in students if a not in seen]
+            for admission in removed:
+                del students[admission]
+
+        self._write(students, self._state(new_pages, students, order, can_jump))
+
+        return {
+            'added': added,
+            'changed': changed,
+            'removed': removed,
+            'total': len(students),
+            'pages_walked': pages_walked,
+            'pages_parsed': pages_parsed,
+            'stopped_early': stopped_early,
+            'elapsed': time.time() - started,
+        }
+
+    def _sync_tail(self, state, students, started):
+        """
+        Oldest-first portals: new students are on the last pages, so read the list
+        from its end until a page has nothing newer than the high-water mark.
+        Returns the summary, or None if the pager has no 'last page' control.
+        """
+        added, changed = [], []
+        pages_walked = 0
+
+        for fingerprint, scrape in self.portal_repo.iter_roster_pages(backwards=True):
+            pages_walked += 1
+            admissions = self._merge_rows(scrape(), students, set(), added, changed)
+            if self._all_older(admissions, state['high_water']):
+                break
+
+        if not pages_walked:
+            return None
+
+        # Page fingerprints are by position from the start; the ones kept still
+        # describe their page correctly or simply no longer match it
+        self._write(students, self._state(state['pages'], students, state['order'], True))
+        return {
+            'added': added,
+            'changed': changed,
+            'removed': [],
+            'total': len(students),
+            'pages_walked': pages_walked,
+            'pages_parsed': pages_walked,
+            'stopped_early': True,
+            'elapsed': time.time() - started,
+        }
+
+    def _merge_rows(self, rows, students, seen, added, changed):
+        """Merge one page's rows into `students`; returns the page's admission numbers"""
+        admissions = []
+        for student in rows:
+            admission, name = student['admission'], ' '.join(student['name'].split())
+            if not admission:
+                continue
+            admissions.append(admission)
+            seen.add(admission)
+            if admission not in students:
+                added.append(admission)
+            elif students[admission] != name:
+                changed.append(admission)
+            students[admission] = name
+        return admissions
+
+    def _all_older(self, admissions, high_water):
+        """True if every admission on the page is at or below the previous high-water mark"""
+        serials = [admission_serial(a) for a in admissions]
+        return (
+            high_water is not None and bool(serials)
+            and all(s is not None and s <= high_water for s in serials)
+        )
+
+    def _state(self, pages, students, order, tail_walk):
+        serials = [s for s in map(admission_serial, students) if s is not None]
+        return {
+            'pages': pages,
+            'high_water': max(serials) if serials else None,
+            'order': order,
+            'tail_walk': tail_walk,
+            'synced_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def _detect_order(self, admissions):
+        serials = [admission_serial(a) for a in admissions]
+        if len(serials) < 2 or None in serials:
+            return None
+        if all(a < b for a, b in zip(serials, serials[1:])):
+            return ORDER_ASCENDING
+        if all(a > b for a, b in zip(serials, serials[1:])):
+            return ORDER_DESCENDING
+        return None
+
+    def _write(self, students, state):
+        """Write roster + state next to each other, replacing the old files atomically"""
+        Path(self.roster_path).parent.mkdir(parents=True, exist_ok=True)
+
+        roster = Roster()
+        for admission, name in students.items():
+            roster.add(admission, name)
+
+        tmp_roster = self.roster_path + ".tmp"
+        roster.save(tmp_roster)
+        os.replace(tmp_roster, self.roster_path)
+
+        tmp_state = self.state_path + ".tmp"
+        with open(tmp_state, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_state, self.state_path)
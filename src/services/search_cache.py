@@ -0,0 +1,34 @@
+import time
+
+class SearchCache:
+    """
+    In-memory cache of portal search results, keyed by class filter and search term.
+    Shared by controllers that run in the same process (batch or watch mode), so a
+    term already searched for one workbook is answered instantly for the next.
+    Empty results are never cached: they may come from a slow or failing portal.
+    Results of a search that stopped before its last page are kept as incomplete:
+    they are only served to a caller whose accept_partial(rows) accepts them.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, target_class, term, accept_partial=None):
+        entry = self._entries.get((target_class or "", term.upper()))
+        if entry and time.monotonic() - entry[0] <= self.ttl:
+            stored_at, results, complete = entry
+            if complete or (accept_partial and accept_partial(results)):
+                self.hits += 1
+                return results
+        self.misses += 1
+        return None
+
+    def put(self, target_class, term, results, complete=True):
+        if results:
+            self._entries[(target_class or "", term.upper())] = (time.monotonic(), results, complete)
+
+    def __len__(self):
+        return len(self._entries)
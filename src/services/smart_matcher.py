@@ -4,10 +4,18 @@ class SmartMatcher:
     """
     Provides intelligent name matching capabilities, including generating
     permutations for failed searches.
+
+    With token statistics (see TokenStats) the retry terms are ranked by how
+    selective they are expected to be: rare name parts first, preceded by the most
+    distinctive pair of parts when every single part is common, capped at
+    `max_terms` per row.
     """
-    
-    def __init__(self):
-        pass
+
+    PAIR_ABOVE_ROWS = 25  # pairs are only worth a search when even the rarest part returns more
+
+    def __init__(self, token_stats=None, max_terms=4):
+        self.token_stats = token_stats
+        self.max_terms = max_terms
 
     def generate_search_terms(self, full_name):
         """
@@ -16,20 +24,47 @@ class SmartMatcher:
         """
         import re
         if not full_name: return []
-        
+
         # Normalize: Remove extra spaces, uppercase
         full_name = re.sub(r'\s+', ' ', full_name.strip().upper())
         parts = full_name.split()
-        
+
         perms = []
-        
+
         # 1. Original (cleaned)
         perms.append(full_name)
-        
+
         # 2. Individual parts (First, Middle, Last)
         for part in parts:
             if len(part) > 2: # Ignore initials
                 perms.append(part)
-        
+
         # Return unique parts, preserving order
-        return list(dict.fromkeys(perms))
+        perms = list(dict.fromkeys(perms))
+        # Empty stats still rank (unknown parts keep name order) and cap the terms
+        if self.token_stats is None:
+            return perms
+
+        return [perms[0]] + self.rank_terms(perms[1:])[:self.max_terms]
+
+    def rank_terms(self, parts):
+        """Order name parts (plus their best pair, if all parts are common) by expected result rows"""
+        estimates = {part: self.token_stats.estimate(part) for part in parts}
+
+        known = [e for e in estimates.values() if e is not None]
+        if len(parts) > 1 and known and len(known) == len(parts) and min(known) > self.PAIR_ABOVE_ROWS:
+            # Only the most selective pair: it narrows the table, the rest would mostly overlap
+            pairs = [f"{first} {second}" for first, second in itertools.combinations(parts, 2)]
+            best_pair = min(pairs, key=self.token_stats.estimate)
+            estimates[best_pair] = self.token_stats.estimate(best_pair)
+
+        def selectivity(term):
+            estimate = estimates[term]
+            if estimate is None:
+                return 1      # never seen in any result yet: probably rare
+            if estimate == 0:
+                return float('inf')  # not on the roster at all (a misspelling?): try last
+            return estimate
+
+        # sorted() is stable: ties keep the name order
+        return sorted(estimates, key=selectivity)
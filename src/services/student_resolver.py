@@ -0,0 +1,72 @@
+from src.models.student_matcher import MATCH_THRESHOLD, SMART_MATCH_THRESHOLD
+from src.utils.name_cleaner import clean_name
+from src.views.logger_view import get_console
+
+STATUS_MATCHED = "matched"
+STATUS_LOW_CONFIDENCE = "low_confidence"
+STATUS_FORCED_UPDATE = "forced_update"
+STATUS_NO_MATCH = "no_match"
+
+def match_status(best_match, score, match_threshold=MATCH_THRESHOLD, smart_threshold=SMART_MATCH_THRESHOLD):
+    """Outcome category of a row, as logged by ScraperController"""
+    if not best_match:
+        return STATUS_NO_MATCH
+    if score >= smart_threshold:
+        return STATUS_MATCHED
+    if score >= match_threshold:
+        return STATUS_LOW_CONFIDENCE
+    return STATUS_FORCED_UPDATE
+
+class StudentResolver:
+    """
+    The per-row search strategy: search by the first name part, and if that gives
+    no acceptable match, retry with the smart-matcher terms until one clears the
+    smart threshold. `search` is any callable term -> portal rows, so the same
+    decision logic runs against the live portal, a recording or an archive.
+    """
+
+    def __init__(self, matcher, smart_matcher, match_threshold=MATCH_THRESHOLD,
+                 smart_threshold=SMART_MATCH_THRESHOLD):
+        self.matcher = matcher
+        self.smart_matcher = smart_matcher
+        self.match_threshold = match_threshold
+        self.smart_threshold = smart_threshold
+        # Smart-retry terms generated for the last row (None if it needed no retry)
+        self.last_terms = None
+        self.console = get_console()
+
+    def resolve(self, student_name, search):
+        """Returns (best_match, score, search_name); search_name is None if the name can't be parsed"""
+        self.last_terms = None
+        search_name = clean_name(student_name)
+        if not search_name:
+            return None, 0, None
+
+        # --- Standard Search ---
+        portal_results = search(search_name)
+        best_match, score = self.matcher.find_best_match(student_name, portal_results)
+
+        # --- Smart Retry Loop (if no good match) ---
+        if (not best_match or score < self.match_threshold):
+            self.console.info(f"    ... Standard search failed. Trying individual name components...")
+            search_terms = self.smart_matcher.generate_search_terms(student_name)
+            self.last_terms = search_terms
+
+            for term in search_terms:
+                if term.lower() == search_name.lower(): continue # Skip what we just did
+
+                self.console.info(f"    ? Trying: {term}")
+                term_results = search(term)
+
+                # IMPORTANT: We match against the ORIGINAL FULL NAME logic from Excel,
+                # but using the new results found by the single key term.
+                term_match, term_score = self.matcher.find_best_match(student_name, term_results)
+
+                if term_match and term_score >= self.smart_threshold: # High threshold for safety
+                    best_match = term_match
+                    score = term_score
+                    search_name = term # Update for logging what actually worked
+                    self.console.info(f"    ✓ Smart Match found via '{term}'!")
+                    break
+
+        return best_match, score, search_name
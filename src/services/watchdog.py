@@ -0,0 +1,206 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from src.views.logger_view import get_console
+
+try:
+    import psutil
+except ImportError:  # optional: without it only the search-count recycling applies
+    psutil = None
+
+class OperationTimeout(Exception):
+    """A browser operation did not finish before its deadline"""
+
+
+class Deadline:
+    """
+    Time left for one operation. Time spent paused (e.g. waiting for the rate
+    limiter) does not count, and renew() starts a fresh allowance (e.g. per page).
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+        self._pauses = 0
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        with self._lock:
+            if self._pauses:
+                return self.seconds
+            return self.expires - time.monotonic()
+
+    def renew(self):
+        with self._lock:
+            self.expires = time.monotonic() + self.seconds
+
+    @contextmanager
+    def paused(self):
+        with self._lock:
+            self._pauses += 1
+            started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pauses -= 1
+                self.expires += time.monotonic() - started
+
+
+# Deadline of the operation running in the current thread (set by run_with_deadline)
+_current = threading.local()
+
+@contextmanager
+def deadline_paused():
+    """Stop the current operation's deadline clock for the block (no-op outside run_with_deadline)"""
+    deadline = getattr(_current, 'deadline', None)
+    if deadline is None:
+        yield
+        return
+    with deadline.paused():
+        yield
+
+def renew_deadline():
+    """Give the current operation a fresh allowance (no-op outside run_with_deadline)"""
+    deadline = getattr(_current, 'deadline', None)
+    if deadline is not None:
+        deadline.renew()
+
+
+def run_with_deadline(func, deadline, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) in a helper thread and wait at most `deadline` seconds
+    (not counting time func spends in deadline_paused(); renew_deadline() restarts it).
+    Raises OperationTimeout if it is still running; the stuck call is abandoned
+    (it fails on its own once the driver underneath it is killed).
+    """
+    clock = Deadline(deadline)
+    outcome = {}
+
+    def target():
+        _current.deadline = clock
+        try:
+            outcome['value'] = func(*args, **kwargs)
+        except BaseException as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    while worker.is_alive():
+        remaining = clock.remaining()
+        if remaining <= 0:
+            raise OperationTimeout(f"{getattr(func, '__name__', func)} exceeded {deadline:g}s")
+        worker.join(remaining)
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('value')
+
+
+class BrowserWatchdog:
+    """
+    Puts a deadline on every browser operation of a run and keeps the driver healthy:
+      - a login, class-filter or search call that overruns its deadline gets the
+        driver killed and restarted, logged in again and the class filter re-applied
+        (the caller then retries what it was doing)
+      - the driver is recycled proactively every `recycle_every` searches, or when
+        Chrome's memory use passes `memory_limit_mb` (needs psutil)
+    """
+
+    MEMORY_CHECK_EVERY = 25  # searches between memory samples
+
+    def __init__(self, browser_manager, auth_manager, class_filter_manager, username, password,
+                 target_class=None, search_deadline=60, session_deadline=120,
+                 recycle_every=400, memory_limit_mb=1500):
+        self.browser = browser_manager
+        self.auth_manager = auth_manager
+        self.class_filter_manager = class_filter_manager
+        self.username = username
+        self.password = password
+        self.target_class = target_class
+        self.search_deadline = search_deadline
+        self.session_deadline = session_deadline
+        self.recycle_every = recycle_every
+        self.memory_limit_mb = memory_limit_mb
+        self.restarts = 0
+        self.recycles = 0
+        self.console = get_console()
+
+    def start_session(self):
+        """Browser up, logged in, class filter set. Returns False if login failed."""
+        run_with_deadline(self.browser.ensure_started, self.session_deadline)
+
+        if run_with_deadline(self.auth_manager.is_logged_in, self.session_deadline):
+            self.console.info("✓ Reusing logged-in browser session")
+        elif not run_with_deadline(self.auth_manager.login, self.session_deadline, self.username, self.password):
+            return False
+
+        run_with_deadline(self.class_filter_manager.set_class_filter, self.session_deadline, self.target_class)
+        return True
+
+    def search(self, search_func, term, **kwargs):
+        """
+        search_func(term, **kwargs) under the search deadline, which applies per result
+        page and excludes rate-limiter waits; restarts the browser if it hangs or dies
+        """
+        try:
+            results = run_with_deadline(search_func, self.search_deadline, term, **kwargs)
+        except OperationTimeout as e:
+            self.console.warning(f"  ⏰ Browser hung ({e}) - restarting it")
+            self.restart()
+            raise
+
+        if not results and not self._driver_alive():
+            self.console.warning("  ⏰ Browser is no longer responding - restarting it")
+            self.restart()
+            raise OperationTimeout("browser died during search")
+
+        self.browser.searches += 1
+        self._maybe_recycle()
+        return results
+
+    def restart(self):
+        """Kill the driver and bring a fresh, logged-in session up"""
+        self.restarts += 1
+        self.browser.kill()
+        if not self.start_session():
+            raise OperationTimeout("login failed after browser restart")
+
+    def browser_memory_mb(self):
+        """Resident memory of chromedriver and every Chrome process under it, or None"""
+        service = getattr(getattr(self.browser, 'driver', None), 'service', None)
+        process = getattr(service, 'process', None)
+        if psutil is None or process is None:
+            return None
+        try:
+            root = psutil.Process(process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    def status(self):
+        return f"browser restarts: {self.restarts} | recycles: {self.recycles}"
+
+    def _driver_alive(self):
+        try:
+            return run_with_deadline(self.browser.is_alive, 10)
+        except OperationTimeout:
+            return False
+
+    def _maybe_recycle(self):
+        searches = self.browser.searches
+        reason = None
+        if self.recycle_every and searches >= self.recycle_every:
+            reason = f"{searches} searches"
+        elif self.memory_limit_mb and searches % self.MEMORY_CHECK_EVERY == 0:
+            memory = self.browser_memory_mb()
+            if memory is not None and memory > self.memory_limit_mb:
+                reason = f"{memory:.0f} MB in use"
+
+        if reason:
+            self.console.info(f"  ♻ Recycling browser ({reason})")
+            self.recycles += 1
+            self.browser.kill()
+            if not self.start_session():
+                raise OperationTimeout("login failed after browser recycle")
@@ -3,6 +3,8 @@ import re
 import glob
 from pathlib import Path
 
+from src.views.logger_view import get_console
+
 class LogParser:
     """Parses scraper log files to determine the status of previous runs."""
     
@@ -11,10 +13,11 @@ class LogParser:
     STATUS_ERROR = "ERROR"
 
     @staticmethod
-    def find_latest_log_for_excel(excel_path):
+    def find_latest_log_for_excel(excel_path, exclude=None):
         """
         Finds the most recent log file corresponding to the given Excel file.
         Assumes log files are in 'logs/' directory with format '{excel_basename}_{timestamp}.log'.
+        `exclude`: the current run's own log file, which must not count as history.
         """
         excel_name = Path(excel_path).stem
         log_dir = Path("logs")
@@ -26,6 +29,8 @@ class LogParser:
         # Pattern: exact name + underscore + timestamp + .log
         pattern = str(log_dir / f"{excel_name}_*.log")
         log_files = glob.glob(pattern)
+        if exclude:
+            log_files = [f for f in log_files if os.path.abspath(f) != os.path.abspath(exclude)]
         
         if not log_files:
             return None
@@ -78,6 +83,6 @@ class LogParser:
                             row_statuses[row_idx] = status
                             
         except Exception as e:
-            print(f"⚠ Error parsing log file {log_path}: {e}")
+            get_console().warning(f"⚠ Error parsing log file {log_path}: {e}")
             
         return row_statuses
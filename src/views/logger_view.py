@@ -1,8 +1,121 @@
+import atexit
+import json
 import logging
-import os
+import logging.handlers
+import queue
+import sys
 from pathlib import Path
 from datetime import datetime
 
+# Console verbosity levels (-q / default / -v)
+VERBOSITY_QUIET = -1
+VERBOSITY_NORMAL = 0
+VERBOSITY_VERBOSE = 1
+
+CONSOLE_LOGGER_NAME = "Scraper.console"
+
+# One background writer per logger name: { logger_name: QueueListener }
+_listeners = {}
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line (machine-readable log)."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S'),
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _attach_queue(logger, handlers):
+    """
+    Route `logger` through a QueueHandler and write `handlers` from a background
+    thread. Any handlers/listener from a previous call are torn down first, so
+    calling this repeatedly for the same logger never stacks handlers.
+    """
+    _detach_queue(logger)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    listener.start()
+    _listeners[logger.name] = listener
+
+
+def _detach_queue(logger):
+    """Stop the background writer for `logger` (flushing it) and drop its handlers."""
+    listener = _listeners.pop(logger.name, None)
+    if listener:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@atexit.register
+def _stop_all_listeners():
+    for name in list(_listeners):
+        _detach_queue(logging.getLogger(name))
+
+
+def configure_console(verbosity=VERBOSITY_NORMAL):
+    """
+    Configure the shared console channel used for progress output.
+    quiet: warnings/errors only | normal: per-row progress | verbose: per-candidate detail
+    """
+    if verbosity <= VERBOSITY_QUIET:
+        level = logging.WARNING
+    elif verbosity >= VERBOSITY_VERBOSE:
+        level = logging.DEBUG
+    else:
+        level = logging.INFO
+
+    console = logging.getLogger(CONSOLE_LOGGER_NAME)
+    console.setLevel(level)
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _attach_queue(console, [handler])
+    return console
+
+
+def configure_worker_console(level):
+    """
+    Console for a worker process: the parent's background writer thread does not
+    exist there (fork copies only the calling thread), so records would pile up in
+    the inherited queue. Workers write straight to stdout at the parent's level.
+    """
+    console = logging.getLogger(CONSOLE_LOGGER_NAME)
+    for handler in list(console.handlers):
+        console.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    console.addHandler(handler)
+    console.setLevel(level)
+    console.propagate = False
+    # The parent's listener is not ours to stop; no listener marks the console as
+    # configured so get_console() keeps this handler.
+    _listeners[console.name] = None
+    return console
+
+
+def get_console():
+    """Returns the console channel, configuring it with default verbosity on first use."""
+    console = logging.getLogger(CONSOLE_LOGGER_NAME)
+    if CONSOLE_LOGGER_NAME not in _listeners:
+        configure_console()
+    return console
+
+
 class LoggerView:
     def __init__(self, excel_path):
         self.excel_path = excel_path
@@ -10,27 +123,33 @@ class LoggerView:
 
     def setup_logging(self, log_dir="./logs"):
         """Setup file logging for the scraping session"""
-        
+
         # Create logs directory if it doesn't exist
         Path(log_dir).mkdir(exist_ok=True)
-        
+
         # Create log filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         excel_name = Path(self.excel_path).stem
         log_file = f"{log_dir}/{excel_name}_{timestamp}.log"
-        
+        json_file = f"{log_dir}/{excel_name}_{timestamp}.jsonl"
+
         # Setup logger
         self.logger = logging.getLogger(f"Scraper_{excel_name}")
         self.logger.setLevel(logging.INFO)
-        
-        # File handler
+
+        # File handler (human-readable, also parsed back by LogParser)
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.INFO)
-        
+
+        # JSON lines handler (machine-readable, one record per line)
+        json_handler = logging.FileHandler(json_file, encoding='utf-8')
+        json_handler.setLevel(logging.INFO)
+        json_handler.setFormatter(JsonLineFormatter())
+
         # Console handler (still print important stuff)
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.WARNING)  # Only warnings/errors to console
-        
+
         # Format
         formatter = logging.Formatter(
             '%(asctime)s | %(levelname)s | %(message)s',
@@ -38,14 +157,20 @@ class LoggerView:
         )
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
-        
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-        
+
+        # Writes happen on a background thread; re-running setup replaces the
+        # previous handlers instead of adding to them.
+        _attach_queue(self.logger, [file_handler, json_handler, console_handler])
+
         self.logger.info("="*80)
         self.logger.info(f"SCRAPING SESSION STARTED: {excel_name}")
         self.logger.info(f"Log file: {log_file}")
         self.logger.info("="*80)
-        
-        print(f"📝 Logging to: {log_file}")
+
+        get_console().info(f"📝 Logging to: {log_file}")
         return log_file, self.logger
+
+    def close(self):
+        """Flush pending records to disk and release the log files"""
+        if self.logger:
+            _detach_queue(self.logger)
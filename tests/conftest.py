@@ -0,0 +1,90 @@
+import itertools
+
+import openpyxl
+import pytest
+
+from src.services.portal_recorder import PortalRecording
+from src.utils.name_cleaner import clean_name
+from src.views.logger_view import configure_console, VERBOSITY_QUIET
+
+# What the portal lists for the class (admission, name)
+PORTAL_STUDENTS = [
+    ("CDSSJOS/STU/00001", "ADEBAYO TUNDE"),
+    ("CDSSJOS/STU/00002", "OKAFOR CHIOMA"),
+    ("CDSSJOS/STU/00003", "BELLO IBRAHIM"),
+    ("CDSSJOS/STU/00004", "EZE NGOZI"),
+    ("CDSSJOS/STU/00005", "MUSA AISHA"),
+    ("CDSSJOS/STU/00006", "ADEBAYO KEMI"),
+    ("CDSSJOS/STU/00007", "OKAFOR EMEKA"),
+]
+
+# The class workbook as a teacher typed it: reordered, misspelt, one unknown
+WORKBOOK_NAMES = [
+    "TUNDE ADEBAYO",
+    "OKAFOR CHIOMA",
+    "BELLO IBRAHEEM",
+    "EZE NGOZI",
+    "AISHA MUSA",
+    "KEMI ADEBAYO",
+    "EMEKA OKAFOR",
+    "JOHNSON PETERS",
+]
+
+EXPECTED = {
+    "TUNDE ADEBAYO": "CDSSJOS/STU/00001",
+    "OKAFOR CHIOMA": "CDSSJOS/STU/00002",
+    "BELLO IBRAHEEM": "CDSSJOS/STU/00003",
+    "EZE NGOZI": "CDSSJOS/STU/00004",
+    "AISHA MUSA": "CDSSJOS/STU/00005",
+    "KEMI ADEBAYO": "CDSSJOS/STU/00006",
+    "EMEKA OKAFOR": "CDSSJOS/STU/00007",
+    "JOHNSON PETERS": None,
+}
+
+
+def portal_search(term, students=PORTAL_STUDENTS):
+    """Rows whose name contains every word of `term`"""
+    words = term.upper().split()
+    return [
+        {'admission': admission, 'name': name}
+        for admission, name in students
+        if all(word in name.split() for word in words)
+    ]
+
+
+def make_workbook(path, names=WORKBOOK_NAMES, sheet="CLASS"):
+    """Admission numbers in column A, names in column B, from row 3"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet
+    ws.cell(row=2, column=1, value="ADMISSION NO")
+    ws.cell(row=2, column=2, value="NAME")
+    for row_idx, name in enumerate(names, start=3):
+        ws.cell(row=row_idx, column=2, value=name)
+    wb.save(path)
+    return str(path)
+
+
+def make_fixture(path, names=WORKBOOK_NAMES):
+    """A portal recording answering every term a run can search for these names"""
+    recording = PortalRecording(str(path))
+    for name in names:
+        parts = [p for p in name.upper().split() if len(p) > 2]
+        pairs = [f"{a} {b}" for a, b in itertools.combinations(parts, 2)]
+        for term in [clean_name(name), name.upper()] + parts + pairs:
+            recording.add_search(term, portal_search(term), latency=0)
+    return recording.save()
+
+
+def admissions(workbook_path, sheet="CLASS"):
+    """{name: admission} as written in the workbook"""
+    ws = openpyxl.load_workbook(workbook_path, read_only=True)[sheet]
+    return {name: admission for admission, name in ws.iter_rows(min_row=3, max_col=2, values_only=True)}
+
+
+@pytest.fixture
+def replay_class(tmp_path, monkeypatch):
+    """(workbook path, fixture path) in a temp working dir (logs/, archives/ stay there)"""
+    monkeypatch.chdir(tmp_path)
+    configure_console(VERBOSITY_QUIET)
+    return make_workbook(tmp_path / "CLASS.xlsx"), make_fixture(tmp_path / "fixture.json")
@@ -0,0 +1,29 @@
+from src.models.candidate_archive import CandidateArchive
+from src.services.portal_recorder import PortalRecording
+
+PAGE_1 = [{'admission': "CDSSJOS/STU/00001", 'name': "ADEBAYO TUNDE"}]
+ALL_PAGES = PAGE_1 + [{'admission': "CDSSJOS/STU/00006", 'name': "ADEBAYO KEMI"}]
+
+
+def test_later_complete_search_is_archived_again(tmp_path):
+    archive = CandidateArchive(str(tmp_path / "run.jsonl.gz"))
+    # Row 3 stopped after the first page, row 4 walked every page, row 5 reused row 4's
+    archive.add("CLASS", 3, "TUNDE ADEBAYO", [("ADEBAYO", PAGE_1)], tuple(PAGE_1[0].values()), 1.0)
+    archive.add("CLASS", 4, "KEMI ADEBAYO", [("ADEBAYO", ALL_PAGES)], tuple(ALL_PAGES[1].values()), 1.0)
+    archive.add("CLASS", 5, "KEMI ADEBAYO", [("ADEBAYO", ALL_PAGES)], tuple(ALL_PAGES[1].values()), 1.0)
+    archive.close()
+
+    _, records, results_by_term = CandidateArchive.read(archive.path)
+    assert [dict(r['searches'])["ADEBAYO"] for r in records] == [PAGE_1, ALL_PAGES, ALL_PAGES]
+    assert results_by_term["ADEBAYO"] == ALL_PAGES
+
+
+def test_partial_recording_never_replaces_complete_one(tmp_path):
+    recording = PortalRecording(str(tmp_path / "fixture.json"))
+    recording.add_search("ADEBAYO", ALL_PAGES, latency=0, pages=2, complete=True)
+    recording.add_search("ADEBAYO", PAGE_1, latency=0, pages=1, complete=False)
+    assert recording.get_search("ADEBAYO")['rows'] == ALL_PAGES
+
+    recording.add_search("BELLO", PAGE_1, latency=0, pages=1, complete=False)
+    recording.add_search("BELLO", ALL_PAGES, latency=0, pages=2, complete=True)
+    assert recording.get_search("BELLO")['rows'] == ALL_PAGES
@@ -0,0 +1,64 @@
+import os
+
+from conftest import EXPECTED, WORKBOOK_NAMES, admissions
+
+from src.controllers.scraper_controller import ScraperController
+from src.controllers.updates_controller import UpdatesController
+from src.models.identity_cache import IdentityCache
+from src.models.update_sidecar import UpdateSidecar, sidecar_path_for
+from src.services.portal_recorder import ReplayBackend
+
+
+def delta_run(workbook, fixture):
+    controller = ScraperController(
+        workbook, "replay://portal", None, None,
+        replay=ReplayBackend(fixture), identity_cache=IdentityCache(None), delta=True
+    )
+    controller.run()
+    return controller
+
+
+def test_delta_run_leaves_the_workbook_alone(replay_class):
+    workbook, fixture = replay_class
+    before = open(workbook, 'rb').read()
+
+    delta_run(workbook, fixture)
+
+    assert open(workbook, 'rb').read() == before
+    assert not os.path.exists(workbook.replace('.xlsx', '_updated.xlsx'))
+    changes = UpdateSidecar(sidecar_path_for(workbook)).read()
+    matched = {admission for admission in EXPECTED.values() if admission}
+    assert {change['admission'] for change in changes.values()} == matched
+    assert all(change['sheet'] == "CLASS" for change in changes.values())
+
+
+def test_apply_updates_writes_a_full_run(replay_class):
+    workbook, fixture = replay_class
+    delta_run(workbook, fixture)
+
+    output_path = UpdatesController(workbook).apply()
+
+    assert admissions(output_path) == EXPECTED
+    assert not os.path.exists(sidecar_path_for(workbook))
+    assert UpdatesController(workbook).apply() is None  # nothing pending any more
+
+
+def test_delta_rerun_resumes_like_a_full_rerun(replay_class):
+    workbook, fixture = replay_class
+    first = delta_run(workbook, fixture)
+    rerun = delta_run(workbook, fixture)
+
+    full = ScraperController(
+        workbook, "replay://portal", None, None,
+        replay=ReplayBackend(fixture), identity_cache=IdentityCache(None)
+    )
+    full.run()
+    full_rerun = ScraperController(
+        full.output_path, "replay://portal", None, None,
+        replay=ReplayBackend(fixture), identity_cache=IdentityCache(None)
+    )
+    full_rerun.run()
+
+    # Only the rows still unresolved are searched again, as on the _updated workbook
+    assert rerun.portal_repo.searches == full_rerun.portal_repo.searches < first.portal_repo.searches
+    assert len(UpdateSidecar(sidecar_path_for(workbook)).read()) == len(WORKBOOK_NAMES) - 1
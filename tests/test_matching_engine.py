@@ -0,0 +1,60 @@
+import multiprocessing
+
+import pytest
+
+from src.models.roster import Roster
+from src.models.student_matcher import StudentMatcher
+from src.services import matching_engine
+from src.services.matching_engine import MatchingEngine
+from src.views.logger_view import configure_console, get_console, VERBOSITY_QUIET, VERBOSITY_VERBOSE
+
+from conftest import PORTAL_STUDENTS, WORKBOOK_NAMES
+
+
+def make_roster():
+    roster = Roster()
+    for admission, name in PORTAL_STUDENTS:
+        roster.add(admission, name)
+    return roster
+
+
+def rows():
+    return list(enumerate(WORKBOOK_NAMES))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_match_clears_module_state(workers):
+    configure_console(VERBOSITY_QUIET)
+    results = list(MatchingEngine(make_roster(), workers=workers, chunk_size=3).match(rows()))
+
+    assert [key for key, _, _ in results] == [key for key, _ in rows()]
+    assert (matching_engine._roster, matching_engine._index, matching_engine._matcher) == (None, None, None)
+
+
+def test_one_and_many_workers_agree():
+    configure_console(VERBOSITY_QUIET)
+    single = list(MatchingEngine(make_roster(), workers=1).match(rows()))
+    pooled = list(MatchingEngine(make_roster(), workers=2, chunk_size=2).match(rows()))
+    assert single == pooled
+    matched = {WORKBOOK_NAMES[key]: match for key, match, _ in single}
+    assert matched["JOHNSON PETERS"] is None
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_workers_keep_verbose_output(monkeypatch, capfd):
+    configure_console(VERBOSITY_VERBOSE)
+    original = StudentMatcher.find_best_match_in_roster
+
+    def traced(self, name, roster, indices):
+        get_console().debug(f"worker scored {name}")
+        return original(self, name, roster, indices)
+
+    monkeypatch.setattr(StudentMatcher, 'find_best_match_in_roster', traced)
+    try:
+        list(MatchingEngine(make_roster(), workers=2, chunk_size=2).match(rows()))
+        out = capfd.readouterr().out
+    finally:
+        configure_console(VERBOSITY_QUIET)
+
+    for name in WORKBOOK_NAMES[:-1]:
+        assert f"worker scored {name}" in out
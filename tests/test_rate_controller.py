@@ -0,0 +1,20 @@
+import pytest
+
+from src.services.rate_controller import AdaptiveRateController
+from src.views.logger_view import configure_console, VERBOSITY_QUIET
+
+
+def test_backoff_never_exceeds_a_low_max_rate():
+    configure_console(VERBOSITY_QUIET)
+    rate = AdaptiveRateController(max_rate=2, base_cooldown=0)
+    for _ in range(5):
+        rate.record_failure(AdaptiveRateController.FAILURE_ERROR)
+        assert rate.rate <= 2
+    for _ in range(5):
+        rate.record_success(latency=0.1)
+        assert rate.rate <= 2
+
+
+def test_max_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        AdaptiveRateController(max_rate=0)
@@ -0,0 +1,44 @@
+import glob
+
+import pytest
+
+from src.controllers.rescore_controller import RescoreController, load_scorer
+from src.controllers.scraper_controller import ScraperController
+from src.models.identity_cache import IdentityCache
+from src.models.student_matcher import StudentMatcher
+from src.services.portal_recorder import ReplayBackend
+
+
+def archived_run(workbook, fixture):
+    controller = ScraperController(
+        workbook, "replay://portal", None, None,
+        replay=ReplayBackend(fixture), identity_cache=IdentityCache(None)
+    )
+    controller.run()
+    archives = glob.glob("archives/*.jsonl.gz")
+    assert len(archives) == 1
+    return archives[0]
+
+
+def test_rescore_with_the_run_rules_changes_nothing(replay_class):
+    archive = archived_run(*replay_class)
+    _, changes = RescoreController(archive).rescore()
+    assert changes == []
+
+
+def test_stricter_threshold_demotes_fuzzy_matches(replay_class):
+    archive = archived_run(*replay_class)
+    _, changes = RescoreController(archive, match_threshold=0.99, smart_threshold=0.99).rescore()
+    changed = {change['name']: change for change in changes}
+    # Misspelt: never a 99% match
+    assert "BELLO IBRAHEEM" in changed
+    assert changed["BELLO IBRAHEEM"]['new_status'] != changed["BELLO IBRAHEEM"]['old_status']
+    # Exact names (reordered) still score 100%
+    assert "TUNDE ADEBAYO" not in changed
+
+
+def test_variant_threshold_needs_the_builtin_scorer():
+    assert load_scorer(None, 0.9).variant_threshold == 0.9
+    assert isinstance(load_scorer(None), StudentMatcher)
+    with pytest.raises(ValueError):
+        load_scorer("src.models.student_matcher:StudentMatcher", 0.9)
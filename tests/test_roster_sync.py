@@ -0,0 +1,105 @@
+import hashlib
+
+from src.services.roster_sync import RosterSync, ORDER_ASCENDING, ORDER_DESCENDING
+
+
+def student(serial):
+    return {'admission': f"CDSSJOS/STU/{serial:05d}", 'name': f"STUDENT{serial} OKAFOR"}
+
+
+class PagedPortal:
+    """Stands in for PortalRepository.iter_roster_pages: a paged class list"""
+
+    def __init__(self, serials, page_size=10, descending=False, can_jump=True):
+        self.rows = [student(s) for s in serials]
+        self.page_size = page_size
+        self.descending = descending
+        self.can_jump = can_jump
+        self.pages_parsed = 0
+
+    def add(self, serials):
+        new_rows = [student(s) for s in serials]
+        self.rows = new_rows[::-1] + self.rows if self.descending else self.rows + new_rows
+
+    def iter_roster_pages(self, backwards=False):
+        pages = [self.rows[i:i + self.page_size] for i in range(0, len(self.rows), self.page_size)]
+        if backwards:
+            if not self.can_jump:
+                return
+            pages.reverse()
+        for page in pages:
+            fingerprint = hashlib.sha1(repr(page).encode()).hexdigest()
+            yield fingerprint, (lambda page=page: self._parse(page))
+
+    def _parse(self, page):
+        self.pages_parsed += 1
+        return list(page)
+
+
+def test_first_sync_reads_everything(tmp_path):
+    portal = PagedPortal(range(1, 101))
+    sync = RosterSync(portal, tmp_path / "roster.bin")
+
+    summary = sync.sync()
+    assert summary['total'] == 100
+    assert summary['pages_parsed'] == 10
+    assert sync.load_state()['order'] == ORDER_ASCENDING
+    assert sync.load_students() == {s['admission']: s['name'] for s in portal.rows}
+
+
+def test_ascending_delta_reads_from_the_end(tmp_path):
+    portal = PagedPortal(range(1, 101))
+    sync = RosterSync(portal, tmp_path / "roster.bin")
+    sync.sync()
+
+    portal.add(range(101, 116))
+    summary = sync.sync()
+    assert sorted(summary['added']) == [student(s)['admission'] for s in range(101, 116)]
+    assert summary['total'] == 115
+    assert summary['pages_walked'] == 3  # pages 12 and 11 are new, page 10 is all older
+    assert summary['stopped_early']
+
+    summary = sync.sync()
+    assert summary['added'] == [] and summary['pages_walked'] == 1
+
+
+def test_descending_delta_stops_at_known_students(tmp_path):
+    portal = PagedPortal(range(100, 0, -1), descending=True)
+    sync = RosterSync(portal, tmp_path / "roster.bin")
+    sync.sync()
+    assert sync.load_state()['order'] == ORDER_DESCENDING
+
+    portal.add(range(101, 106))
+    summary = sync.sync()
+    assert sorted(summary['added']) == [student(s)['admission'] for s in range(101, 106)]
+    assert summary['total'] == 105
+    assert summary['stopped_early']
+    assert summary['pages_walked'] == 2  # page 1 holds the new students, page 2 is all older
+
+
+def test_pager_without_last_page_falls_back_to_forward_walk(tmp_path):
+    portal = PagedPortal(range(1, 51), can_jump=False)
+    sync = RosterSync(portal, tmp_path / "roster.bin")
+    sync.sync()
+
+    portal.add(range(51, 56))
+    summary = sync.sync()
+    assert sorted(summary['added']) == [student(s)['admission'] for s in range(51, 56)]
+    assert summary['total'] == 55
+    assert sync.load_state()['tail_walk'] is False
+
+    # Unchanged pages are skipped without parsing them
+    portal.pages_parsed = 0
+    summary = sync.sync()
+    assert summary['added'] == [] and portal.pages_parsed == 0
+
+
+def test_full_sync_detects_removed_students(tmp_path):
+    portal = PagedPortal(range(1, 31))
+    sync = RosterSync(portal, tmp_path / "roster.bin")
+    sync.sync()
+
+    portal.rows = [row for row in portal.rows if row['admission'] != student(7)['admission']]
+    summary = sync.sync(full=True)
+    assert summary['removed'] == [student(7)['admission']]
+    assert summary['total'] == 29
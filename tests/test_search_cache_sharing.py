@@ -0,0 +1,48 @@
+import openpyxl
+
+from src.controllers.scraper_controller import ScraperController
+from src.models.identity_cache import IdentityCache
+from src.services.portal_recorder import PortalRecording, ReplayBackend
+from src.services.search_cache import SearchCache
+from src.views.logger_view import configure_console, VERBOSITY_QUIET
+
+
+def make_workbook(path, names):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "CLASS"
+    ws.cell(row=2, column=1, value="ADMISSION NO")
+    ws.cell(row=2, column=2, value="NAME")
+    for row_idx, name in enumerate(names, start=3):
+        ws.cell(row=row_idx, column=2, value=name)
+    wb.save(path)
+    return str(path)
+
+
+def test_empty_shared_search_cache_is_shared(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # logs/ and archives stay in the temp dir
+    configure_console(VERBOSITY_QUIET)
+
+    recording = PortalRecording(str(tmp_path / "fixture.json"))
+    recording.add_search("ADEBAYO", [{'admission': "CDSSJOS/STU/00001", 'name': "ADEBAYO TUNDE"}], latency=0)
+    recording.save()
+
+    search_cache = SearchCache()
+    controllers = []
+    for stem in ("JSS1", "JSS2"):
+        workbook = make_workbook(tmp_path / f"{stem}.xlsx", ["ADEBAYO TUNDE"])
+        controller = ScraperController(
+            workbook, "replay://portal", None, None,
+            replay=ReplayBackend(recording.path),
+            search_cache=search_cache,
+            identity_cache=IdentityCache(None)
+        )
+        controller.run()
+        controllers.append(controller)
+
+    first, second = controllers
+    assert first.search_cache is search_cache and second.search_cache is search_cache
+    assert first.portal_repo.searches == 1
+    assert second.portal_repo.searches == 0
+    assert search_cache.hits >= 1
+    assert len(search_cache) == 1
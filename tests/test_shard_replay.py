@@ -0,0 +1,65 @@
+from conftest import EXPECTED, admissions
+
+from src.controllers.merge_controller import MergeController
+from src.controllers.scraper_controller import ScraperController
+from src.controllers.shard_controller import ShardController, ShardRunController
+from src.models.identity_cache import IdentityCache
+from src.models.work_shard import ShardResults
+from src.services.portal_recorder import ReplayBackend
+
+
+def run_shards(workbook, fixture, count, out_dir="shards"):
+    shard_paths = ShardController(workbook, count, out_dir).run()
+    results_paths = []
+    for shard_path in shard_paths:
+        runner = ShardRunController(
+            shard_path, "replay://portal", None, None, out_dir,
+            replay=ReplayBackend(fixture), identity_cache=IdentityCache(None)
+        )
+        results_paths.append(runner.run())
+    return shard_paths, results_paths
+
+
+def test_run_shard_writes_every_row(replay_class):
+    workbook, fixture = replay_class
+    shard_paths, results_paths = run_shards(workbook, fixture, 2)
+
+    assert len(shard_paths) == 2
+    rows = [row for path in results_paths for row in ShardResults.read(path)[1]]
+    assert sorted(row['name'] for row in rows) == sorted(EXPECTED)
+    assert {row['name']: row['admission'] for row in rows} == EXPECTED
+
+
+def test_merge_matches_a_single_run(replay_class, tmp_path):
+    workbook, fixture = replay_class
+    _, results_paths = run_shards(workbook, fixture, 3)
+
+    output_path, conflicts = MergeController(workbook, results_paths).merge()
+    assert conflicts == []
+    merged = admissions(output_path)
+
+    single = tmp_path / "single"
+    single.mkdir()
+    copy = single / "CLASS.xlsx"
+    copy.write_bytes(open(workbook, 'rb').read())
+    controller = ScraperController(
+        str(copy), "replay://portal", None, None,
+        replay=ReplayBackend(fixture), identity_cache=IdentityCache(None)
+    )
+    controller.run()
+
+    assert merged == admissions(controller.output_path) == EXPECTED
+
+
+def test_rerun_shard_resumes(replay_class):
+    workbook, fixture = replay_class
+    shard_paths, results_paths = run_shards(workbook, fixture, 1)
+
+    rerun = ShardRunController(
+        shard_paths[0], "replay://portal", None, None, "shards",
+        replay=ReplayBackend(fixture), identity_cache=IdentityCache(None)
+    )
+    assert rerun.results.done == {("CLASS", row) for row in range(3, 3 + len(EXPECTED))}
+    rerun.run()
+    assert rerun.controller.portal_repo.searches == 0
+    assert len(ShardResults.read(results_paths[0])[1]) == len(EXPECTED)
@@ -0,0 +1,21 @@
+from src.models.token_stats import TokenStats
+from src.services.smart_matcher import SmartMatcher
+
+NAME = "ADEBAYO OLUWASEUN MUHAMMAD IBRAHIM CHUKWUEMEKA"
+
+
+def test_without_stats_every_part_is_tried_in_name_order():
+    assert SmartMatcher().generate_search_terms(NAME) == [NAME] + NAME.split()
+
+
+def test_empty_stats_still_cap_the_terms():
+    terms = SmartMatcher(TokenStats(), max_terms=3).generate_search_terms(NAME)
+    assert terms == [NAME] + NAME.split()[:3]
+
+
+def test_learned_counts_put_common_parts_last():
+    stats = TokenStats()
+    stats.observe([{'admission': f"CDSSJOS/STU/{i:05d}", 'name': f"MUHAMMAD X{i}"} for i in range(30)])
+    stats.observe([{'admission': "CDSSJOS/STU/99999", 'name': "ADEBAYO IBRAHIM"}])
+    terms = SmartMatcher(stats, max_terms=5).generate_search_terms(NAME)
+    assert terms[-1] == "MUHAMMAD"
@@ -0,0 +1,55 @@
+import random
+
+from benchmark import reference_best_match
+from src.models.roster import Roster
+from src.models.student_matcher import StudentMatcher
+
+FIRST = ["TUNDE", "CHIOMA", "IBRAHIM", "NGOZI", "AISHA", "KEMI", "EMEKA", "FATIMA", "SEGUN", "AMAKA"]
+LAST = ["ADEBAYO", "OKAFOR", "BELLO", "EZE", "MUSA", "OLADIPO", "NWANKWO", "YUSUF", "ADELEKE", "OBI"]
+
+
+def random_name(rng):
+    return f"{rng.choice(LAST)} {rng.choice(FIRST)}"
+
+
+def typed(rng, name):
+    """The name as a teacher might have typed it"""
+    last, first = name.split()
+    roll = rng.random()
+    if roll < 0.3:
+        return f"{first} {last}"
+    if roll < 0.6:
+        i = rng.randrange(len(first))
+        return f"{last} {first[:i]}{rng.choice('AEIOU')}{first[i + 1:]}"
+    if roll < 0.8:
+        return f"{last} {first} {rng.choice(['A', 'B', 'OLU'])}"
+    return random_name(rng)
+
+
+def cases(seed, count=400):
+    rng = random.Random(seed)
+    for _ in range(count):
+        rows = [
+            {'admission': f"CDSSJOS/STU/{i:05d}", 'name': random_name(rng)}
+            for i in range(rng.randint(0, 12))
+        ]
+        target = rows[0]['name'] if rows else random_name(rng)
+        yield typed(rng, target), rows
+
+
+def test_cascade_matches_full_scoring():
+    matcher = StudentMatcher()
+    for excel_name, rows in cases(seed=5):
+        match, score, _ = reference_best_match(excel_name, rows)
+        assert matcher.find_best_match(excel_name, rows) == (match, score), excel_name
+    assert matcher.similarity_pruned > 0
+
+
+def test_roster_cascade_matches_full_scoring():
+    matcher = StudentMatcher()
+    for excel_name, rows in cases(seed=11):
+        roster = Roster()
+        for row in rows:
+            roster.add(row['admission'], row['name'])
+        match, score, _ = reference_best_match(excel_name, rows)
+        assert matcher.find_best_match_in_roster(excel_name, roster) == (match, score), excel_name